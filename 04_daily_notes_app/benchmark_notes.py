@@ -0,0 +1,276 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from notes_manager import NotesManager
+
+# Kata umum sengaja diletakkan di depan: dengan bobot Zipf kata-kata ini
+# muncul di banyak catatan, sedangkan kata sintetis di belakang jarang
+COMMON_WORDS = [
+    "catatan", "rapat", "proyek", "ide", "tugas", "hari", "minggu", "laporan",
+    "belanja", "jadwal", "keluarga", "kantor", "buku", "rencana", "anggaran",
+    "meeting", "review", "deadline", "presentasi", "olahraga", "resep", "liburan",
+    "kesehatan", "keuangan", "belajar", "python", "desain", "klien", "email", "tim",
+]
+VOCABULARY = COMMON_WORDS + [f"kata{i}" for i in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+def _words(rng, count):
+    """Memilih kata dengan distribusi Zipf"""
+    return " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=count))
+
+def generate_notes(count, categories, seed=42, start=datetime(2025, 1, 1), days=365):
+    """Menghasilkan catatan sintetis dengan panjang dan tanggal yang bervariasi
+
+    Judul 2-8 kata, panjang isi mengikuti distribusi log-normal (median
+    sekitar 90 kata dengan sedikit catatan sangat panjang), kategori dan
+    waktu dibuat tersebar acak dalam ``days`` hari.
+    """
+    rng = random.Random(seed)
+    sequence = {}
+    for _ in range(count):
+        created = start + timedelta(seconds=rng.randrange(days * 86400))
+        day = created.strftime("%Y%m%d")
+        sequence[day] = sequence.get(day, 0) + 1
+        timestamp = created.strftime("%Y-%m-%d %H:%M:%S")
+        yield {
+            "id": f"note_{day}_{sequence[day]:03d}",
+            "title": _words(rng, rng.randint(2, 8)).capitalize(),
+            "category": rng.choice(categories),
+            "content": _words(rng, min(max(int(rng.lognormvariate(4.5, 1.0)), 5), 5000)),
+            "created_at": timestamp,
+            "updated_at": timestamp
+        }
+
+def generate_corpus(manager, count, seed=42):
+    """Menulis corpus sintetis langsung ke storage milik manager"""
+    for note in generate_notes(count, manager.categories, seed):
+        manager.storage.write(note)
+
+def drop_page_cache():
+    """Mengosongkan page cache Linux agar pembacaan benar-benar dari disk"""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", 'w') as f:
+            f.write("3\n")
+        return True
+    except OSError:
+        return False
+
+def bench_parallel_load(notes_dir, workers_list, cold=False):
+    """Mengukur waktu membaca semua file catatan dengan berbagai jumlah worker"""
+    manager = NotesManager(notes_dir, os.path.join(notes_dir + "_backup"))
+    note_ids = list(manager.index.entries)
+
+    # Loop lama sebagai pembanding: listdir lalu json.load setiap file
+    if cold and not drop_page_cache():
+        print("Peringatan: page cache tidak bisa dikosongkan, hasil memakai cache")
+    start = time.perf_counter()
+    for filename in os.listdir(notes_dir):
+        if filename.endswith('.json'):
+            with open(os.path.join(notes_dir, filename), 'r', encoding='utf-8') as f:
+                json.load(f)
+    results = [{"loader": "serial loop", "seconds": time.perf_counter() - start}]
+
+    for workers in workers_list:
+        manager.workers = workers
+        if cold:
+            drop_page_cache()
+        start = time.perf_counter()
+        loaded = sum(1 for _ in manager.iter_load_notes(note_ids))
+        results.append({
+            "loader": f"iter_load_notes workers={workers}",
+            "seconds": time.perf_counter() - start,
+            "notes": loaded
+        })
+    return results
+
+def _measure(name, func, repeat=1):
+    """Menjalankan func beberapa kali dan mencatat waktu median per putaran"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        "name": name,
+        "seconds": statistics.median(samples),
+        "min_seconds": min(samples),
+        "repeat": repeat
+    }
+
+def _measure_ops(name, func, args_list):
+    """Menjalankan func untuk setiap argumen dan mencatat latensi per operasi"""
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "name": name,
+        "seconds": sum(samples),
+        "ops": len(samples),
+        "per_op": statistics.mean(samples),
+        "p95": samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    }
+
+def run_suite(base_dir, count, storage="json", seed=42, ops=200, repeat=3):
+    """Menjalankan seluruh benchmark NotesManager untuk satu ukuran corpus"""
+    notes_dir = os.path.join(base_dir, f"{storage}_{count}", "notes")
+    backup_dir = os.path.join(base_dir, f"{storage}_{count}", "backup")
+    results = []
+
+    manager = NotesManager(notes_dir, backup_dir, storage=storage)
+    start = time.perf_counter()
+    generate_corpus(manager, count, seed)
+    results.append({"name": "generate", "seconds": time.perf_counter() - start, "ops": count})
+    manager.close()
+
+    # Pembukaan pertama membangun manifest, pembukaan kedua memakai manifest
+    for name in ("open_cold", "open_warm"):
+        start = time.perf_counter()
+        manager = NotesManager(notes_dir, backup_dir, storage=storage)
+        results.append({"name": name, "seconds": time.perf_counter() - start})
+        if name == "open_cold":
+            manager.close()
+
+    rng = random.Random(seed)
+    note_ids = list(manager.storage.scan())
+    month = manager.get_note_by_id(note_ids[0])['created_at'][:7]
+    category = manager.categories[0]
+
+    results.append(_measure_ops("create", manager.create_note, [
+        (f"Benchmark {i}", rng.choice(manager.categories), _words(rng, 90))
+        for i in range(ops)
+    ]))
+    results.append(_measure_ops(
+        "get_note_by_id", manager.get_note_by_id,
+        [(rng.choice(note_ids),) for _ in range(ops)]
+    ))
+    results.append(_measure("get_all", manager.get_all_notes, repeat))
+    results.append(_measure("iter_notes_page", lambda: list(manager.iter_notes(limit=10)), repeat))
+    results.append(_measure_ops("search", manager.search_notes, [
+        ("rapat",), ("kata42",), ("pres",), ("proyek laporan",)
+    ] * repeat))
+    results.append(_measure(
+        "search_substring", lambda: manager.search_notes("rapat", mode="substring"), 1
+    ))
+    results.append(_measure(
+        "filter_month", lambda: manager.get_notes_by_date_range(month, month), repeat
+    ))
+    results.append(_measure(
+        "filter_month_category",
+        lambda: manager.get_notes_by_date_range(month, month, category), repeat
+    ))
+    results.append(_measure(
+        "filter_category", lambda: manager.get_notes_by_category(category), repeat
+    ))
+
+    start = time.perf_counter()
+    backup_file = manager.create_backup()
+    results.append({"name": "backup_full", "seconds": time.perf_counter() - start})
+    results.append(_measure("backup_incremental_first", lambda: manager.create_backup(incremental=True)))
+    manager.update_note(note_ids[0], content="Diubah untuk benchmark")
+    results.append(_measure("backup_incremental", lambda: manager.create_backup(incremental=True)))
+    results.append(_measure("restore", lambda: manager.restore_backup(backup_file)))
+
+    manager.close()
+    for result in results:
+        result.update({"storage": storage, "notes": count})
+    return results
+
+def compare_results(results, baseline, threshold=1.2):
+    """Membandingkan hasil dengan baseline, mengembalikan baris yang melambat"""
+    previous = {
+        (r['storage'], r['notes'], r['name']): r['seconds'] for r in baseline['results']
+    }
+    regressions = []
+    for result in results:
+        before = previous.get((result['storage'], result['notes'], result['name']))
+        if before and result['seconds'] > before * threshold:
+            regressions.append(dict(result, baseline_seconds=before))
+    return regressions
+
+def main():
+    """Menjalankan benchmark dari command line"""
+    parser = argparse.ArgumentParser(description="Benchmark NotesManager")
+    parser.add_argument("--notes", type=int, nargs="+", default=[1000, 10000],
+                        help="ukuran corpus sintetis")
+    parser.add_argument("--storage", nargs="+", default=["json"],
+                        choices=["json", "packed", "sqlite"])
+    parser.add_argument("--dir", default="bench_notes", help="direktori corpus")
+    parser.add_argument("--seed", type=int, default=42, help="seed corpus sintetis")
+    parser.add_argument("--ops", type=int, default=200, help="jumlah operasi create/get per putaran")
+    parser.add_argument("--output", help="simpan hasil dalam format JSON ke file ini")
+    parser.add_argument("--compare", help="file JSON hasil sebelumnya sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="rasio perlambatan yang dianggap regresi")
+    parser.add_argument("--parallel-load", action="store_true",
+                        help="hanya bandingkan pemuatan paralel dengan loop lama")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--cold", action="store_true", help="kosongkan page cache sebelum tiap putaran (butuh root)")
+    parser.add_argument("--keep", action="store_true", help="jangan hapus corpus yang dibuat run ini")
+    args = parser.parse_args()
+
+    # Direktori yang sudah ada (misal corpus yang dipakai ulang --parallel-load)
+    # bukan milik run ini dan tidak pernah dihapus
+    created = not os.path.exists(args.dir)
+    try:
+        if args.parallel_load:
+            notes_dir = os.path.join(args.dir, "notes")
+            if not os.path.exists(notes_dir):
+                print(f"Membuat {args.notes[0]} catatan di {notes_dir}...")
+                manager = NotesManager(notes_dir, notes_dir + "_backup")
+                generate_corpus(manager, args.notes[0], args.seed)
+                manager.close()
+            results = bench_parallel_load(notes_dir, args.workers, cold=args.cold)
+            baseline = results[0]['seconds']
+            for result in results:
+                print(f"{result['loader']:32s} {result['seconds']:8.3f}s  x{baseline / result['seconds']:.2f}")
+            return
+
+        results = []
+        for storage in args.storage:
+            for count in args.notes:
+                print(f"Benchmark {storage} dengan {count} catatan...")
+                results.extend(run_suite(args.dir, count, storage, args.seed, args.ops))
+
+        print(f"\n{'storage':8s} {'notes':>7s} {'benchmark':26s} {'detik':>10s} {'per op':>10s}")
+        for result in results:
+            per_op = f"{result['per_op'] * 1000:8.3f}ms" if 'per_op' in result else ""
+            print(f"{result['storage']:8s} {result['notes']:7d} {result['name']:26s} "
+                  f"{result['seconds']:10.4f} {per_op:>10s}")
+
+        report = {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "results": results
+        }
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=4)
+            print(f"\nHasil disimpan ke {args.output}")
+
+        if args.compare:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                regressions = compare_results(results, json.load(f), args.threshold)
+            for result in regressions:
+                print(f"REGRESI {result['storage']} {result['notes']} {result['name']}: "
+                      f"{result['baseline_seconds']:.4f}s -> {result['seconds']:.4f}s")
+            if regressions:
+                sys.exit(1)
+    finally:
+        if created and not args.keep:
+            shutil.rmtree(args.dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import argparse
+import os
+from note_storage import STORAGE_BACKENDS, NoteCodec, migrate_notes
+
+def print_progress(done, total):
+    """Menampilkan progress migrasi di satu baris"""
+    print(f"\rMemindahkan catatan: {done}/{total}", end="", flush=True)
+    if done == total:
+        print()
+
+def main():
+    """Memindahkan catatan antar backend storage"""
+    parser = argparse.ArgumentParser(description="Migrasi storage catatan")
+    parser.add_argument("--notes-dir", default="notes", help="direktori catatan")
+    parser.add_argument("--source", choices=sorted(STORAGE_BACKENDS), default="json")
+    parser.add_argument("--target", choices=sorted(STORAGE_BACKENDS), default="packed")
+    parser.add_argument("--remove-source", action="store_true",
+                        help="hapus catatan dari storage asal setelah migrasi")
+    parser.add_argument("--compression", choices=["zlib", "lzma"],
+                        help="kompres catatan besar di storage tujuan")
+    parser.add_argument("--compress-threshold", type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("Storage asal dan tujuan tidak boleh sama")
+    if not os.path.exists(args.notes_dir):
+        parser.error(f"Direktori {args.notes_dir} tidak ditemukan")
+
+    source = STORAGE_BACKENDS[args.source](args.notes_dir)
+    try:
+        codec = NoteCodec(args.compression, args.compress_threshold)
+        target = STORAGE_BACKENDS[args.target](args.notes_dir, codec=codec)
+    except ValueError as e:
+        parser.error(str(e))
+    source.open()
+    target.open()
+    try:
+        count = migrate_notes(source, target, progress=print_progress)
+        if args.remove_source:
+            for note_id in list(source.scan()):
+                source.delete(note_id)
+    finally:
+        source.close()
+        target.close()
+
+    print(f"{count} catatan dipindahkan dari '{args.source}' ke '{args.target}'.")
+    if args.compression:
+        stats = codec.stats()
+        print(f"{stats['compressed']} catatan dikompres, hemat {stats['bytes_saved']} byte.")
+    print(f"Jalankan aplikasi dengan: python notes_app.py --storage {args.target}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+
+class NoteCache:
+    """Cache LRU catatan yang sudah di-parse, divalidasi dengan stamp storage"""
+
+    def __init__(self, capacity=256):
+        """Inisialisasi cache dengan kapasitas tertentu (0 berarti nonaktif)"""
+        if capacity < 0:
+            raise ValueError("Kapasitas cache tidak boleh negatif!")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # Dipakai bersama oleh thread pemuat paralel
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, note_id, stamp):
+        """Mengambil salinan catatan jika stamp-nya masih sama, None jika tidak"""
+        with self._lock:
+            entry = self._entries.get(note_id)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(note_id)
+            self.hits += 1
+            # Salinan agar perubahan pemanggil tidak mengotori cache
+            return dict(entry[1])
+
+    def put(self, note, stamp):
+        """Menyimpan salinan catatan beserta stamp-nya"""
+        if not self.capacity or stamp is None:
+            return
+        with self._lock:
+            self._entries[note['id']] = (stamp, dict(note))
+            self._entries.move_to_end(note['id'])
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def discard(self, note_id):
+        """Membuang satu catatan dari cache"""
+        with self._lock:
+            self._entries.pop(note_id, None)
+
+    def clear(self):
+        """Mengosongkan cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Ringkasan isi dan penghitung hit/miss cache"""
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
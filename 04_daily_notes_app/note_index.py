@@ -0,0 +1,227 @@
+import abc
+import bisect
+import json
+import os
+from note_storage import file_lock
+
+class LogIndex(abc.ABC):
+    def __init__(self, path):
+        """Inisialisasi indeks yang disimpan sebagai log append-only"""
+        self.path = path
+        # Penulis dan pembaca memegang lock agar baris terpotong saat load
+        # pasti sisa crash, bukan tulisan proses lain yang belum selesai
+        self.lock_path = path + ".lock"
+        self.records = 0
+        # Ukuran log yang sudah tercermin di memori; berbeda dari ukuran file
+        # berarti ada record proses lain yang belum dibaca
+        self.size = 0
+        self.reset()
+
+    @abc.abstractmethod
+    def reset(self):
+        """Mengosongkan isi indeks di memori"""
+
+    @abc.abstractmethod
+    def _apply(self, record):
+        """Menerapkan satu record log ke indeks di memori"""
+
+    @abc.abstractmethod
+    def _snapshot(self):
+        """Menghasilkan record minimal yang mewakili isi indeks"""
+
+    @abc.abstractmethod
+    def __len__(self):
+        """Jumlah entri yang masih berlaku"""
+
+    def _loaded(self):
+        """Dipanggil setelah seluruh log dibaca, misal untuk menyusun struktur turunan"""
+
+    def load(self):
+        """Memuat indeks dari file log"""
+        if os.path.exists(self.path):
+            with file_lock(self.lock_path):
+                self._read_log()
+        else:
+            self._read_log()
+        self._loaded()
+
+    def _read_log(self):
+        """Membaca ulang seluruh log, harus dipanggil sambil memegang lock"""
+        self.reset()
+        self.records = 0
+        self.size = 0
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb+') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("baris belum lengkap")
+                    record = json.loads(line)
+                except ValueError:
+                    # Baris terpotong (misal crash saat menulis) dibuang agar
+                    # record berikutnya tidak tersambung ke baris rusak
+                    f.truncate(self.size)
+                    break
+                self._apply(record)
+                self.records += 1
+                self.size += len(line)
+
+    def _append(self, record):
+        """Menambahkan record ke akhir file log"""
+        self._apply(record)
+        with file_lock(self.lock_path), open(self.path, 'ab') as f:
+            in_sync = os.fstat(f.fileno()).st_size == self.size
+            f.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+            if in_sync:
+                self.size = f.tell()
+        self.records += 1
+
+        # Padatkan log jika isinya didominasi record usang
+        if self.records > 2 * len(self) + 1000:
+            self.compact()
+
+    def compact(self):
+        """Menulis ulang log hanya dengan record yang masih berlaku
+
+        File sementara memakai PID agar proses lain yang juga sedang
+        memadatkan tidak menulis ke file yang sama.
+        """
+        temp_path = f"{self.path}.compact.{os.getpid()}"
+        with file_lock(self.lock_path):
+            if os.path.exists(self.path) and os.path.getsize(self.path) != self.size:
+                # Record proses lain belum terbaca, ikut dipadatkan
+                self._read_log()
+                self._loaded()
+            records = 0
+            with open(temp_path, 'wb') as f:
+                for record in self._snapshot():
+                    f.write((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                    records += 1
+                size = f.tell()
+            os.replace(temp_path, self.path)
+            self.records = records
+            self.size = size
+
+
+class NoteIndex(LogIndex):
+    def reset(self):
+        """Mengosongkan manifest di memori"""
+        self.entries = {}
+        self.signature = None
+        # Indeks sekunder: daftar (created_at, id) terurut, total dan per kategori.
+        # None berarti belum dibangun (misal selama load)
+        self.by_date = None
+        self.by_category = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _loaded(self):
+        """Menyusun indeks tanggal dan kategori sekaligus setelah manifest dimuat"""
+        self.build_secondary()
+
+    def build_secondary(self):
+        """Menyusun ulang indeks sekunder dari seluruh entri"""
+        self.by_date = sorted(
+            (meta['created_at'], note_id) for note_id, meta in self.entries.items()
+        )
+        self.by_category = {}
+        for key in self.by_date:
+            category = self.entries[key[1]]['category']
+            self.by_category.setdefault(category, []).append(key)
+
+    def _unlink(self, note_id):
+        """Menghapus satu catatan dari indeks sekunder"""
+        meta = self.entries.get(note_id)
+        if not meta or self.by_date is None:
+            return
+        key = (meta['created_at'], note_id)
+        for keys in (self.by_date, self.by_category.get(meta['category'], [])):
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    def _link(self, note_id, meta):
+        """Menambahkan satu catatan ke indeks sekunder"""
+        if self.by_date is None:
+            return
+        key = (meta['created_at'], note_id)
+        bisect.insort(self.by_date, key)
+        bisect.insort(self.by_category.setdefault(meta['category'], []), key)
+
+    def _apply(self, record):
+        """Menerapkan satu record log ke manifest di memori"""
+        if record['op'] in ('put', 'del'):
+            # Saat load indeks sekunder belum ada dan dibangun sekali di akhir
+            self._unlink(record['id'])
+        if record['op'] == 'put':
+            self.entries[record['id']] = record['meta']
+            self._link(record['id'], record['meta'])
+        elif record['op'] == 'del':
+            self.entries.pop(record['id'], None)
+        if 'signature' in record:
+            self.signature = record['signature']
+
+    def _bounds(self, start, end, category):
+        """Mencari batas rentang created_at di daftar terurut"""
+        if self.by_date is None:
+            self.build_secondary()
+        keys = self.by_date if category is None else self.by_category.get(category, [])
+        low = bisect.bisect_left(keys, (start,)) if start else 0
+        # "\uffff" lebih besar dari karakter apa pun di belakang prefix end
+        high = bisect.bisect_left(keys, (end + "\uffff",)) if end else len(keys)
+        return keys, low, high
+
+    def query(self, start=None, end=None, category=None, newest_first=True):
+        """Mengambil ID catatan dalam rentang created_at, terbaru lebih dulu
+
+        ``start`` dan ``end`` adalah prefix tanggal inklusif, misal
+        ``"2025-11"`` atau ``"2025-11-08"``.
+        """
+        keys, low, high = self._bounds(start, end, category)
+        # Rentang disalin saat query dimulai; posisi di daftar hidup bergeser
+        # jika catatan ditambah atau dihapus selama pemanggil masih mengiterasi
+        note_ids = [key[1] for key in keys[low:high]]
+        return reversed(note_ids) if newest_first else iter(note_ids)
+
+    def count(self, start=None, end=None, category=None):
+        """Menghitung catatan dalam rentang tanpa menelusurinya"""
+        _, low, high = self._bounds(start, end, category)
+        return max(high - low, 0)
+
+    def _snapshot(self):
+        """Menghasilkan record put untuk setiap catatan"""
+        for note_id, meta in self.entries.items():
+            yield {"op": "put", "id": note_id, "meta": meta}
+        if self.signature is not None:
+            yield {"op": "mark", "signature": self.signature}
+
+    def put(self, note, stamp, signature=None):
+        """Menyimpan metadata catatan ke manifest"""
+        record = {
+            "op": "put",
+            "id": note['id'],
+            "meta": {
+                "title": note['title'],
+                "category": note['category'],
+                "created_at": note['created_at'],
+                "updated_at": note['updated_at'],
+                "stamp": stamp
+            }
+        }
+        if signature is not None:
+            record['signature'] = signature
+        self._append(record)
+
+    def remove(self, note_id, signature=None):
+        """Menghapus metadata catatan dari manifest"""
+        record = {"op": "del", "id": note_id}
+        if signature is not None:
+            record['signature'] = signature
+        self._append(record)
+
+    def mark(self, signature):
+        """Mencatat signature storage saat manifest dinyatakan valid"""
+        self._append({"op": "mark", "signature": signature})
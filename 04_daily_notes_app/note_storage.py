@@ -0,0 +1,833 @@
+import json
+import lzma
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows tidak punya fcntl
+    fcntl = None
+
+@contextmanager
+def file_lock(path):
+    """Mengunci file secara eksklusif antar proses (jika fcntl tersedia)"""
+    with open(path, 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def process_alive(pid):
+    """Memeriksa apakah proses dengan PID tertentu masih berjalan"""
+    if os.name == "nt":
+        # os.kill di Windows menghentikan proses, anggap saja masih hidup
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def encode_note(note):
+    """Mengubah catatan menjadi JSON ringkas dalam bytes"""
+    return json.dumps(note, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class NoteCodec:
+    """Kompresi opsional isi catatan beserta metriknya
+
+    Catatan yang JSON-nya lebih kecil dari ``threshold`` byte tetap
+    disimpan polos. Data terkompresi dikenali dari magic bytes-nya
+    (zlib ``0x78``, xz ``\\xfd7zXZ``), sehingga pembacaan selalu
+    transparan, termasuk untuk storage yang dibuka tanpa kompresi.
+    """
+
+    LZMA_MAGIC = b"\xfd7zXZ\x00"
+    METHODS = {
+        "zlib": (zlib.compress, zlib.decompress),
+        "lzma": (lzma.compress, lzma.decompress),
+    }
+
+    def __init__(self, method=None, threshold=1024):
+        """Inisialisasi codec, method None berarti tanpa kompresi"""
+        if method is not None and method not in self.METHODS:
+            raise ValueError("Metode kompresi tidak valid!")
+        self.method = method
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._stats = {
+            "written": 0, "compressed": 0, "plain_bytes": 0, "stored_bytes": 0,
+            "reads_plain": 0, "reads_compressed": 0,
+            "read_seconds_plain": 0.0, "read_seconds_compressed": 0.0
+        }
+
+    def compress(self, data):
+        """Mengompresi JSON catatan, None jika catatan tetap disimpan polos"""
+        stored = None
+        if self.method and len(data) >= self.threshold:
+            stored = self.METHODS[self.method][0](data)
+            # Data yang tidak mengecil (misal sudah acak) lebih baik tetap polos
+            if len(stored) >= len(data):
+                stored = None
+        with self._lock:
+            self._stats['written'] += 1
+            self._stats['plain_bytes'] += len(data)
+            self._stats['stored_bytes'] += len(stored) if stored else len(data)
+            if stored:
+                self._stats['compressed'] += 1
+        return stored
+
+    def pack(self, data):
+        """Bytes yang disimpan untuk JSON catatan, terkompresi atau polos"""
+        return self.compress(data) or data
+
+    def _method_of(self, data):
+        """Mengenali metode kompresi dari magic bytes, None jika polos"""
+        if data.startswith(self.LZMA_MAGIC):
+            return "lzma"
+        if data[:1] == b"\x78":
+            return "zlib"
+        return None
+
+    def unpack(self, data):
+        """Mengembalikan JSON polos dari data yang tersimpan"""
+        data = bytes(data)
+        method = self._method_of(data)
+        return self.METHODS[method][1](data) if method else data
+
+    def decode(self, data):
+        """Membaca catatan dari data tersimpan sambil mencatat latensinya"""
+        start = time.perf_counter()
+        data = bytes(data)
+        kind = "compressed" if self._method_of(data) else "plain"
+        note = json.loads(self.unpack(data))
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._stats[f"reads_{kind}"] += 1
+            self._stats[f"read_seconds_{kind}"] += elapsed
+        return note
+
+    def stats(self):
+        """Metrik kompresi: byte yang dihemat dan rata-rata latensi baca"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats.update({
+            "method": self.method,
+            "threshold": self.threshold,
+            "bytes_saved": stats['plain_bytes'] - stats['stored_bytes'],
+        })
+        for kind in ("plain", "compressed"):
+            reads = stats[f"reads_{kind}"]
+            stats[f"avg_read_ms_{kind}"] = (
+                stats[f"read_seconds_{kind}"] / reads * 1000 if reads else 0.0
+            )
+        return stats
+
+
+class JsonNoteStorage:
+    """Satu file JSON per catatan di direktori catatan"""
+
+    def __init__(self, notes_dir, codec=None):
+        """Inisialisasi storage file JSON"""
+        self.notes_dir = notes_dir
+        self.codec = codec or NoteCodec()
+
+    def _note_path(self, note_id):
+        """Path file untuk catatan dengan ID tertentu"""
+        return os.path.join(self.notes_dir, f"{note_id}.json")
+
+    def _swap_paths(self):
+        """Path direktori staging dan direktori lama untuk proses restore"""
+        base = os.path.normpath(self.notes_dir)
+        return base + ".staging", base + ".old"
+
+    def open(self):
+        """Menyiapkan direktori catatan, merapikan restore yang terhenti"""
+        staging_dir, old_dir = self._swap_paths()
+        if os.path.exists(old_dir):
+            if os.path.exists(self.notes_dir):
+                # Pertukaran sudah selesai, tinggal membuang direktori lama
+                shutil.rmtree(old_dir)
+            else:
+                # Terhenti di antara dua rename, kembalikan catatan lama
+                os.rename(old_dir, self.notes_dir)
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+        os.makedirs(self.notes_dir, exist_ok=True)
+
+    def close(self):
+        """Storage file JSON tidak menyimpan handle yang perlu ditutup"""
+
+    def signature(self):
+        """Nilai murah yang berubah jika ada catatan ditambah atau dihapus"""
+        return os.stat(self.notes_dir).st_mtime_ns
+
+    def scan(self):
+        """Mengambil stamp (mtime, ukuran) semua catatan"""
+        stamps = {}
+        for filename in os.listdir(self.notes_dir):
+            if not filename.endswith('.json'):
+                continue
+            stamp = self.stamp(filename[:-5])
+            if stamp:
+                stamps[filename[:-5]] = stamp
+        return stamps
+
+    def stamp(self, note_id):
+        """Stamp satu catatan, None jika tidak ada"""
+        try:
+            stat = os.stat(self._note_path(note_id))
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _read_stored(self, note_id):
+        """Membaca isi file catatan apa adanya (bisa terkompresi)"""
+        try:
+            with open(self._note_path(note_id), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def read_raw(self, note_id):
+        """Membaca JSON catatan dalam bytes, didekompresi jika perlu"""
+        data = self._read_stored(note_id)
+        return self.codec.unpack(data) if data is not None else None
+
+    def read(self, note_id):
+        """Membaca catatan berdasarkan ID"""
+        data = self._read_stored(note_id)
+        return self.codec.decode(data) if data is not None else None
+
+    def write(self, note, exclusive=False):
+        """Menulis file catatan secara atomik lewat file sementara"""
+        filename = self._note_path(note['id'])
+        temp_path = os.path.join(self.notes_dir, f".{note['id']}.{os.getpid()}.tmp")
+        compressed = self.codec.compress(encode_note(note))
+        if compressed:
+            with open(temp_path, 'wb') as f:
+                f.write(compressed)
+        else:
+            # Catatan di bawah threshold tetap berformat JSON yang mudah dibaca
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(note, f, indent=4, ensure_ascii=False)
+
+        try:
+            # Hard link gagal jika file sudah ada, rename menimpa secara atomik
+            if exclusive:
+                os.link(temp_path, filename)
+            else:
+                os.replace(temp_path, filename)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return self.stamp(note['id'])
+
+    def delete(self, note_id):
+        """Menghapus file catatan"""
+        try:
+            os.remove(self._note_path(note_id))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def begin_restore(self):
+        """Menyiapkan direktori staging untuk restore"""
+        staging_dir, _ = self._swap_paths()
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+        os.makedirs(staging_dir)
+        return staging_dir
+
+    def put_restore(self, staging_dir, note_id, data):
+        """Menulis satu catatan hasil restore ke staging"""
+        with open(os.path.join(staging_dir, f"{note_id}.json"), 'wb') as f:
+            f.write(self.codec.pack(data))
+
+    def commit_restore(self, staging_dir):
+        """Menukar direktori staging dengan direktori catatan"""
+        _, old_dir = self._swap_paths()
+        os.rename(self.notes_dir, old_dir)
+        os.rename(staging_dir, self.notes_dir)
+        shutil.rmtree(old_dir)
+
+    def abort_restore(self, staging_dir):
+        """Membuang staging restore yang gagal"""
+        if os.path.exists(staging_dir):
+            shutil.rmtree(staging_dir)
+
+
+class PackedNoteStorage:
+    """Semua catatan dalam satu file log append-only dengan indeks offset
+
+    Setiap record berformat ``PUT <id> <panjang> <versi>\\n<json>\\n`` atau
+    ``DEL <id> 0 <versi>\\n\\n``. Versi naik setiap penulisan dan ikut
+    disalin saat compaction, sehingga stamp catatan tidak berubah walau
+    offset-nya berpindah. Record lama yang sudah tertimpa dibuang oleh
+    compaction yang berjalan di thread terpisah.
+    """
+
+    COMPACT_MIN_BYTES = 1024 * 1024
+    # Header record dipisah spasi dan diakhiri newline, jadi ID tidak boleh
+    # memuat whitespace
+    ID_PATTERN = re.compile(r"\S+")
+
+    def __init__(self, notes_dir, codec=None, filename="notes.pack"):
+        """Inisialisasi storage log append-only"""
+        self.notes_dir = notes_dir
+        self.codec = codec or NoteCodec()
+        self.path = os.path.join(notes_dir, filename)
+        self.lock_path = self.path + ".lock"
+        self.offsets = {}
+        self.version = 0
+        self.live_bytes = 0
+        self.dead_bytes = 0
+        self._file = None
+        self._mmap = None
+        self._scanned = 0
+        self._lock = threading.RLock()
+        self._compactor = None
+        self._compacting = False
+
+    def open(self):
+        """Membuka file log dan membangun indeks offset"""
+        os.makedirs(self.notes_dir, exist_ok=True)
+        with file_lock(self.lock_path):
+            self._remove_leftovers()
+            self._reopen()
+            # Potong record terakhir yang tidak lengkap akibat crash
+            if self._scanned < os.fstat(self._file.fileno()).st_size:
+                self._mmap = None
+                self._file.truncate(self._scanned)
+
+    def _temp_path(self, kind):
+        """Path file sementara compaction/restore milik proses ini"""
+        return f"{self.path}.{kind}.{os.getpid()}"
+
+    def _remove_leftovers(self):
+        """Menghapus file sementara yang ditinggalkan proses yang sudah mati
+
+        Harus dipanggil sambil memegang file lock. File milik proses yang
+        masih hidup dibiarkan karena salinan pertama compaction dan staging
+        restore ditulis tanpa lock.
+        """
+        for kind in ("compact", "staging"):
+            prefix = f"{os.path.basename(self.path)}.{kind}."
+            for filename in os.listdir(self.notes_dir):
+                pid = filename[len(prefix):]
+                if filename.startswith(prefix) and pid.isdigit() and not process_alive(int(pid)):
+                    os.remove(os.path.join(self.notes_dir, filename))
+
+    def close(self):
+        """Menunggu compaction selesai lalu menutup file log"""
+        if self._compactor:
+            self._compactor.join()
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+            self._mmap = None
+
+    def _reopen(self):
+        """Membuka ulang file log dari awal (misal setelah compaction)"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+            self._file = open(self.path, 'ab+')
+            self._mmap = None
+            self.offsets = {}
+            self.live_bytes = 0
+            self.dead_bytes = 0
+            self._scanned = 0
+            self._scan_tail()
+
+    def _view(self, size):
+        """Memetakan file log ke memori, dipetakan ulang jika file bertambah"""
+        if size == 0:
+            return b""
+        if self._mmap is None or len(self._mmap) < size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def _scan_tail(self):
+        """Membaca record yang ditambahkan sejak pemindaian terakhir"""
+        size = os.fstat(self._file.fileno()).st_size
+        view = self._view(size)
+        position = self._scanned
+        while position < size:
+            newline = view.find(b"\n", position, size)
+            if newline == -1:
+                break
+            try:
+                op, note_id, length, version = view[position:newline].decode('utf-8').split(" ")
+                length, version = int(length), int(version)
+            except ValueError:
+                break
+            start = newline + 1
+            end = start + length
+            if end >= size:
+                break
+
+            old = self.offsets.pop(note_id, None)
+            if old:
+                self.live_bytes -= old[1]
+                self.dead_bytes += old[1]
+            if op == "PUT":
+                self.offsets[note_id] = [start, length, version]
+                self.live_bytes += length
+            self.version = max(self.version, version)
+            position = end + 1
+        self._scanned = position
+
+    def _check_id(self, note_id):
+        """Menolak ID yang akan merusak header record sebelum ditulis"""
+        if not isinstance(note_id, str) or not self.ID_PATTERN.fullmatch(note_id):
+            raise ValueError(f"ID catatan tidak valid: {note_id!r}")
+
+    def _append(self, op, note_id, payload, exclusive=False):
+        """Menambahkan satu record ke akhir log"""
+        with self._lock:
+            with file_lock(self.lock_path):
+                # File sudah diganti compaction proses lain, buka ulang dulu
+                if os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino:
+                    self._reopen()
+                self._scan_tail()
+                if exclusive and note_id in self.offsets:
+                    raise FileExistsError(note_id)
+
+                header = f"{op} {note_id} {len(payload)} {self.version + 1}\n"
+                self._file.seek(0, os.SEEK_END)
+                self._file.write(header.encode('utf-8') + payload + b"\n")
+                self._file.flush()
+                self._scan_tail()
+            self._maybe_compact()
+
+    def signature(self):
+        """Inode dan ukuran file log, berubah pada setiap penulisan"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return [stat.st_ino, stat.st_size]
+
+    def refresh(self):
+        """Mengikuti record yang ditulis proses lain
+
+        Jika inode dan ukuran file sama dengan yang terakhir dipindai,
+        cukup satu stat tanpa membaca log.
+        """
+        with self._lock:
+            stat = os.stat(self.path)
+            if stat.st_ino != os.fstat(self._file.fileno()).st_ino:
+                self._reopen()
+            elif stat.st_size != self._scanned:
+                self._scan_tail()
+
+    def scan(self):
+        """Mengambil stamp (versi, panjang) semua catatan"""
+        self.refresh()
+        with self._lock:
+            return {
+                note_id: [version, length]
+                for note_id, (_, length, version) in self.offsets.items()
+            }
+
+    def stamp(self, note_id):
+        """Stamp satu catatan, None jika tidak ada"""
+        with self._lock:
+            # Diperbarui dulu agar tulisan proses lain terlihat oleh pemanggil
+            self.refresh()
+            entry = self.offsets.get(note_id)
+            return [entry[2], entry[1]] if entry else None
+
+    def _read_stored(self, note_id):
+        """Membaca payload satu catatan langsung dari memory map"""
+        with self._lock:
+            entry = self.offsets.get(note_id)
+            if not entry:
+                return None
+            start, length, _ = entry
+            return self._view(start + length)[start:start + length]
+
+    def read_raw(self, note_id):
+        """Membaca JSON catatan dalam bytes, didekompresi jika perlu"""
+        data = self._read_stored(note_id)
+        return self.codec.unpack(data) if data is not None else None
+
+    def read(self, note_id):
+        """Membaca catatan berdasarkan ID"""
+        data = self._read_stored(note_id)
+        return self.codec.decode(data) if data is not None else None
+
+    def write(self, note, exclusive=False):
+        """Menambahkan versi baru catatan ke log"""
+        self._check_id(note['id'])
+        with self._lock:
+            self._append("PUT", note['id'], self.codec.pack(encode_note(note)), exclusive)
+            return self.stamp(note['id'])
+
+    def delete(self, note_id):
+        """Menandai catatan sebagai terhapus di log"""
+        with self._lock:
+            self.refresh()
+            if note_id not in self.offsets:
+                return False
+            self._append("DEL", note_id, b"")
+            return True
+
+    def _maybe_compact(self):
+        """Menjalankan compaction di background jika log didominasi record usang"""
+        with self._lock:
+            if self._compacting:
+                return
+            if self.dead_bytes < max(self.live_bytes, self.COMPACT_MIN_BYTES):
+                return
+            self._compacting = True
+        self._compactor = threading.Thread(target=self._background_compact, daemon=True)
+        self._compactor.start()
+
+    def _background_compact(self):
+        """Menjalankan compaction di thread terpisah"""
+        try:
+            self.compact()
+        except BaseException:
+            with self._lock:
+                self._compacting = False
+            raise
+
+    def _write_records(self, out, records, view):
+        """Menyalin payload record yang masih berlaku ke file baru"""
+        for note_id, (start, length, version) in records:
+            out.write(f"PUT {note_id} {length} {version}\n".encode('utf-8'))
+            out.write(view[start:start + length])
+            out.write(b"\n")
+
+    def compact(self):
+        """Menulis ulang log hanya dengan versi terbaru setiap catatan"""
+        temp_path = self._temp_path("compact")
+        with self._lock:
+            self.refresh()
+            records = list(self.offsets.items())
+            view = self._view(self._scanned)
+            scanned = self._scanned
+
+        # Salinan utama dibuat tanpa menahan lock agar pembaca tidak terhambat
+        with open(temp_path, 'wb') as out:
+            self._write_records(out, records, view)
+
+        with self._lock, file_lock(self.lock_path):
+            self.refresh()
+            if self._scanned != scanned:
+                # Ada penulisan selama compaction, salin ulang dari indeks terbaru
+                with open(temp_path, 'wb') as out:
+                    self._write_records(out, list(self.offsets.items()), self._view(self._scanned))
+            os.replace(temp_path, self.path)
+            self._reopen()
+            # Dilepas di dalam lock agar penulisan berikutnya bisa memicu
+            # compaction baru walau thread ini belum benar-benar selesai
+            self._compacting = False
+
+    def begin_restore(self):
+        """Menyiapkan file log staging untuk restore"""
+        self.refresh()
+        # Versi melanjutkan log lama agar stamp catatan hasil restore tidak
+        # tertukar dengan stamp lama di manifest
+        return {"file": open(self._temp_path("staging"), 'wb'), "version": self.version}
+
+    def put_restore(self, staging, note_id, data):
+        """Menulis satu catatan hasil restore ke log staging"""
+        self._check_id(note_id)
+        payload = self.codec.pack(encode_note(self.codec.decode(data)))
+        staging['version'] += 1
+        header = f"PUT {note_id} {len(payload)} {staging['version']}\n"
+        staging['file'].write(header.encode('utf-8') + payload + b"\n")
+
+    def commit_restore(self, staging):
+        """Mengganti file log dengan staging dalam satu rename atomik"""
+        staging['file'].close()
+        with self._lock, file_lock(self.lock_path):
+            os.replace(staging['file'].name, self.path)
+            self._reopen()
+
+    def abort_restore(self, staging):
+        """Membuang staging restore yang gagal"""
+        staging['file'].close()
+        if os.path.exists(staging['file'].name):
+            os.remove(staging['file'].name)
+
+
+class SqliteNoteStorage:
+    """Catatan disimpan di database SQLite dengan indeks FTS5 untuk pencarian
+
+    Setiap penulisan menaikkan counter ``version`` di tabel ``meta``;
+    nilai ini menjadi signature storage dan, bersama ukuran catatan,
+    stamp setiap catatan. Kolom ``created_at`` dan ``category`` diindeks
+    sehingga filter tanggal/kategori dijawab langsung oleh database.
+    """
+
+    TITLE_WEIGHT = 3.0
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS notes (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            category TEXT NOT NULL,
+            content TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS notes_created_at ON notes (created_at, id);
+        CREATE INDEX IF NOT EXISTS notes_category ON notes (category, created_at, id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        INSERT OR IGNORE INTO meta VALUES ('version', 0);
+        CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5 (
+            title, content, content='notes', content_rowid='seq'
+        );
+        CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+            INSERT INTO notes_fts (rowid, title, content)
+            VALUES (new.seq, new.title, new.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, title, content)
+            VALUES ('delete', old.seq, old.title, old.content);
+        END;
+        CREATE TRIGGER IF NOT EXISTS notes_au AFTER UPDATE ON notes BEGIN
+            INSERT INTO notes_fts (notes_fts, rowid, title, content)
+            VALUES ('delete', old.seq, old.title, old.content);
+            INSERT INTO notes_fts (rowid, title, content)
+            VALUES (new.seq, new.title, new.content);
+        END;
+    """
+
+    FIELDS = ("id", "title", "category", "content", "created_at", "updated_at")
+
+    def __init__(self, notes_dir, codec=None, filename="notes.db"):
+        """Inisialisasi storage SQLite"""
+        # Isi catatan harus polos agar bisa diindeks FTS5
+        if codec is not None and codec.method:
+            raise ValueError("Kompresi tidak didukung untuk storage sqlite!")
+        self.notes_dir = notes_dir
+        self.path = os.path.join(notes_dir, filename)
+        self._conn = None
+        # Satu koneksi dipakai bersama oleh thread pemuat paralel
+        self._lock = threading.RLock()
+
+    def open(self):
+        """Membuka database dalam mode WAL dan membuat skema jika belum ada"""
+        os.makedirs(self.notes_dir, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        # WAL membuat pembaca di proses lain tidak terhalang penulis
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def close(self):
+        """Menutup koneksi database"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+    @contextmanager
+    def _transaction(self):
+        """Menjalankan blok dalam satu transaksi tulis"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _next_version(self, conn):
+        """Menaikkan counter versi di dalam transaksi yang sedang berjalan"""
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        return conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def _insert(self, conn, note, version, upsert):
+        """Menulis satu baris catatan, mengembalikan ukurannya"""
+        size = len(encode_note(note))
+        sql = (
+            "INSERT INTO notes (id, title, category, content, created_at, updated_at, version, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        if upsert:
+            sql += (
+                " ON CONFLICT (id) DO UPDATE SET title = excluded.title,"
+                " category = excluded.category, content = excluded.content,"
+                " created_at = excluded.created_at, updated_at = excluded.updated_at,"
+                " version = excluded.version, size = excluded.size"
+            )
+        conn.execute(sql, [note[field] for field in self.FIELDS] + [version, size])
+        return size
+
+    def signature(self):
+        """Counter versi database, berubah pada setiap penulisan"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()[0]
+
+    def scan(self):
+        """Mengambil stamp (versi, ukuran) semua catatan"""
+        with self._lock:
+            return {
+                note_id: [version, size]
+                for note_id, version, size in self._conn.execute(
+                    "SELECT id, version, size FROM notes"
+                )
+            }
+
+    def stamp(self, note_id):
+        """Stamp satu catatan, None jika tidak ada"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, size FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+        return list(row) if row else None
+
+    def read(self, note_id):
+        """Membaca catatan berdasarkan ID"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.FIELDS)} FROM notes WHERE id = ?", (note_id,)
+            ).fetchone()
+        return dict(zip(self.FIELDS, row)) if row else None
+
+    def read_raw(self, note_id):
+        """Membaca catatan dalam bentuk JSON bytes (untuk backup)"""
+        note = self.read(note_id)
+        return encode_note(note) if note else None
+
+    def write(self, note, exclusive=False):
+        """Menyimpan catatan dalam satu transaksi"""
+        with self._transaction() as conn:
+            version = self._next_version(conn)
+            try:
+                size = self._insert(conn, note, version, upsert=not exclusive)
+            except sqlite3.IntegrityError:
+                raise FileExistsError(note['id'])
+        return [version, size]
+
+    def delete(self, note_id):
+        """Menghapus catatan"""
+        with self._transaction() as conn:
+            if not conn.execute("DELETE FROM notes WHERE id = ?", (note_id,)).rowcount:
+                return False
+            self._next_version(conn)
+            return True
+
+    def _where(self, start, end, category):
+        """Menyusun klausa WHERE untuk filter rentang tanggal dan kategori"""
+        clauses, params = [], []
+        if start:
+            clauses.append("created_at >= ?")
+            params.append(start)
+        if end:
+            # "\uffff" lebih besar dari karakter apa pun di belakang prefix end
+            clauses.append("created_at < ?")
+            params.append(end + "\uffff")
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, start=None, end=None, category=None, newest_first=True):
+        """Mengambil ID catatan dalam rentang created_at memakai indeks kolom"""
+        where, params = self._where(start, end, category)
+        direction = "DESC" if newest_first else "ASC"
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id FROM notes{where} ORDER BY created_at {direction}, id {direction}",
+                params
+            ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def count(self, start=None, end=None, category=None):
+        """Menghitung catatan dalam rentang tanpa membaca isinya"""
+        where, params = self._where(start, end, category)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM notes{where}", params).fetchone()[0]
+
+    def search(self, tokens):
+        """Mencari ID catatan yang memuat semua token sebagai prefix, diurutkan bm25"""
+        if not tokens:
+            return []
+        match = " AND ".join(f'"{token}"*' for token in tokens)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT notes.id FROM notes_fts JOIN notes ON notes.seq = notes_fts.rowid "
+                "WHERE notes_fts MATCH ? ORDER BY bm25(notes_fts, ?, 1.0), notes.id",
+                (match, self.TITLE_WEIGHT)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def begin_restore(self):
+        """Memulai transaksi restore; isi lama baru hilang saat commit"""
+        # Lock dilepas di commit_restore/abort_restore
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM notes")
+            # Versi melanjutkan counter lama agar stamp tidak tertukar
+            return {"version": self._next_version(self._conn)}
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            self._lock.release()
+            raise
+
+    def put_restore(self, staging, note_id, data):
+        """Menulis satu catatan hasil restore di dalam transaksi"""
+        self._insert(self._conn, json.loads(data), staging['version'], upsert=True)
+
+    def commit_restore(self, staging):
+        """Menyelesaikan restore secara atomik"""
+        try:
+            self._conn.execute("COMMIT")
+        finally:
+            self._lock.release()
+
+    def abort_restore(self, staging):
+        """Membatalkan restore, isi lama tetap utuh"""
+        try:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+        finally:
+            self._lock.release()
+
+
+STORAGE_BACKENDS = {
+    "json": JsonNoteStorage,
+    "packed": PackedNoteStorage,
+    "sqlite": SqliteNoteStorage,
+}
+
+def migrate_notes(source, target, progress=None):
+    """Menyalin semua catatan dari satu storage ke storage lain"""
+    note_ids = list(source.scan())
+    for done, note_id in enumerate(note_ids, 1):
+        note = source.read(note_id)
+        if note:
+            target.write(note)
+        if progress:
+            progress(done, len(note_ids))
+    return len(note_ids)
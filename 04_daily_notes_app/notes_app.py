@@ -1,6 +1,8 @@
 from notes_manager import NotesManager
+from note_storage import STORAGE_BACKENDS
+import argparse
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 
 def print_note(note):
     """Menampilkan detail catatan"""
@@ -57,6 +59,66 @@ def create_note(manager):
     except Exception as e:
         print(f"\nError: {str(e)}")
 
+def page_through(fetch_page, total, page_size=10):
+    """Menampilkan hasil per halaman, hanya memuat halaman yang sedang dilihat"""
+    offset = 0
+    while offset < total:
+        for note in fetch_page(offset, page_size):
+            print_note(note)
+        offset += page_size
+        if offset >= total:
+            break
+        print(f"\nMenampilkan {offset} dari {total} catatan")
+        if input("Tekan Enter untuk halaman berikutnya, 'q' untuk berhenti: ").lower() == 'q':
+            break
+
+def filter_by_date_range(manager):
+    """Menu filter catatan per minggu/bulan/rentang tanggal, opsional per kategori"""
+    print("\n1. Minggu ini")
+    print("2. Bulan tertentu")
+    print("3. Rentang tanggal")
+    choice = input("\nPilihan Anda (1-3): ")
+
+    try:
+        if choice == '1':
+            today = datetime.now().date()
+            start = today - timedelta(days=today.weekday())
+            start_date = start.strftime('%Y-%m-%d')
+            end_date = (start + timedelta(days=6)).strftime('%Y-%m-%d')
+        elif choice == '2':
+            month = input("\nMasukkan bulan (YYYY-MM): ")
+            datetime.strptime(month, '%Y-%m')
+            start_date = end_date = month
+        elif choice == '3':
+            start_date = input("\nTanggal awal (YYYY-MM-DD): ")
+            end_date = input("Tanggal akhir (YYYY-MM-DD): ")
+            datetime.strptime(start_date, '%Y-%m-%d')
+            datetime.strptime(end_date, '%Y-%m-%d')
+        else:
+            return
+    except ValueError:
+        print("Format tanggal tidak valid!")
+        return
+
+    category = None
+    if input("Filter kategori juga? (y/n): ").lower() == 'y':
+        category = get_valid_category(manager)
+
+    try:
+        total = manager.count_notes(start_date, end_date, category)
+        if not total:
+            print("\nTidak ada catatan dalam rentang tersebut!")
+            return
+        print(f"\nDitemukan {total} catatan")
+        page_through(
+            lambda offset, limit: manager.get_notes_by_date_range(
+                start_date, end_date, category, offset=offset, limit=limit
+            ),
+            total
+        )
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+
 def view_notes(manager):
     """Menu melihat catatan"""
     while True:
@@ -65,17 +127,21 @@ def view_notes(manager):
         print("2. Cari berdasarkan tanggal")
         print("3. Cari berdasarkan kategori")
         print("4. Cari berdasarkan kata kunci")
-        print("5. Kembali ke menu utama")
+        print("5. Cari teks persis (substring)")
+        print("6. Filter rentang tanggal & kategori")
+        print("7. Kembali ke menu utama")
 
-        choice = input("\nPilihan Anda (1-5): ")
+        choice = input("\nPilihan Anda (1-7): ")
 
         if choice == '1':
-            notes = manager.get_all_notes()
-            if not notes:
+            total = manager.count_notes()
+            if not total:
                 print("\nBelum ada catatan!")
                 continue
-            for note in notes:
-                print_note(note)
+            page_through(
+                lambda offset, limit: manager.iter_notes(offset=offset, limit=limit),
+                total
+            )
 
         elif choice == '2':
             date = input("\nMasukkan tanggal (YYYY-MM-DD): ")
@@ -109,6 +175,18 @@ def view_notes(manager):
                 print_note(note)
 
         elif choice == '5':
+            keyword = input("\nMasukkan teks yang dicari: ")
+            notes = manager.search_notes(keyword, mode="substring")
+            if not notes:
+                print("\nTidak ada catatan yang cocok!")
+                continue
+            for note in notes:
+                print_note(note)
+
+        elif choice == '6':
+            filter_by_date_range(manager)
+
+        elif choice == '7':
             break
 
 def edit_note(manager):
@@ -200,19 +278,26 @@ def delete_note(manager):
     except ValueError:
         print("Input tidak valid!")
 
+def print_progress(done, total):
+    """Menampilkan progress restore di satu baris"""
+    print(f"\rMemulihkan catatan: {done}/{total}", end="", flush=True)
+    if done == total:
+        print()
+
 def backup_restore(manager):
     """Menu backup dan restore"""
     while True:
         print("\n=== Backup & Restore ===")
-        print("1. Buat backup")
-        print("2. Pulihkan dari backup")
-        print("3. Kembali ke menu utama")
+        print("1. Buat backup penuh (zip)")
+        print("2. Buat backup incremental")
+        print("3. Pulihkan dari backup")
+        print("4. Kembali ke menu utama")
 
-        choice = input("\nPilihan Anda (1-3): ")
+        choice = input("\nPilihan Anda (1-4): ")
 
-        if choice == '1':
+        if choice in ('1', '2'):
             try:
-                backup_file = manager.create_backup()
+                backup_file = manager.create_backup(incremental=(choice == '2'))
                 if backup_file:
                     print(f"Backup berhasil dibuat: {backup_file}")
                 else:
@@ -220,8 +305,8 @@ def backup_restore(manager):
             except Exception as e:
                 print(f"Error: {str(e)}")
 
-        elif choice == '2':
-            backups = [f for f in os.listdir(manager.backup_dir) if f.endswith('.zip')]
+        elif choice == '3':
+            backups = manager.list_backups()
             if not backups:
                 print("Tidak ada file backup!")
                 continue
@@ -239,7 +324,7 @@ def backup_restore(manager):
                     confirm = input("Proses ini akan menimpa semua catatan yang ada. Lanjutkan? (y/n): ")
                     if confirm.lower() == 'y':
                         try:
-                            manager.restore_backup(backup_file)
+                            manager.restore_backup(backup_file, progress=print_progress)
                             print("Restore berhasil!")
                         except Exception as e:
                             print(f"Error: {str(e)}")
@@ -248,12 +333,29 @@ def backup_restore(manager):
             except ValueError:
                 print("Input tidak valid!")
 
-        elif choice == '3':
+        elif choice == '4':
             break
 
 def main():
     """Fungsi utama program"""
-    manager = NotesManager()
+    parser = argparse.ArgumentParser(description="Daily Notes App")
+    parser.add_argument("--storage", choices=sorted(STORAGE_BACKENDS), default="json",
+                        help="backend penyimpanan catatan")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="jumlah catatan yang disimpan di cache (0 untuk menonaktifkan)")
+    parser.add_argument("--compression", choices=["zlib", "lzma"],
+                        help="kompres catatan besar saat disimpan")
+    parser.add_argument("--compress-threshold", type=int, default=1024,
+                        help="ukuran minimal (byte) catatan yang dikompres")
+    args = parser.parse_args()
+
+    try:
+        manager = NotesManager(
+            storage=args.storage, cache_size=args.cache_size,
+            compression=args.compression, compress_threshold=args.compress_threshold
+        )
+    except ValueError as e:
+        parser.error(str(e))
     
     while True:
         print("\n=== Daily Notes App ===")
@@ -278,6 +380,7 @@ def main():
             backup_restore(manager)
         elif choice == '6':
             print("\nTerima kasih telah menggunakan Daily Notes App!")
+            manager.close()
             break
         else:
             print("Pilihan tidak valid!")
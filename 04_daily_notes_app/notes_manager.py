@@ -1,24 +1,205 @@
+import itertools
 import json
 import os
 from datetime import datetime
-import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from note_cache import NoteCache
+from note_index import NoteIndex
+from note_storage import STORAGE_BACKENDS, NoteCodec, file_lock
+from search_index import SearchIndex, tokenize
+from snapshot_store import SnapshotStore
 
 class NotesManager:
-    def __init__(self, notes_dir="notes", backup_dir="backup"):
+    def __init__(self, notes_dir="notes", backup_dir="backup", workers=1, storage="json",
+                 cache_size=256, compression=None, compress_threshold=1024):
         """Inisialisasi NotesManager"""
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError("Storage tidak valid!")
+
         self.notes_dir = notes_dir
         self.backup_dir = backup_dir
+        self.workers = workers
+        # Catatan terkompresi selalu bisa dibaca, compression hanya mengatur penulisan
+        self.codec = NoteCodec(compression, compress_threshold)
+        self.storage = STORAGE_BACKENDS[storage](notes_dir, codec=self.codec)
         self.categories = ["Personal", "Pekerjaan", "Ide", "To-Do", "Lainnya"]
         
-        # Buat direktori jika belum ada
-        os.makedirs(self.notes_dir, exist_ok=True)
+        self.index_dir = os.path.join(self.notes_dir, ".index")
+        # Storage yang menjawab query/count sendiri (SQLite) tidak butuh manifest
+        self.index = None
+        if not hasattr(self.storage, "query"):
+            self.index = NoteIndex(os.path.join(self.index_dir, "manifest.log"))
+        # Storage dengan pencarian sendiri (SQLite FTS5) tidak butuh inverted index
+        self.search_index = None
+        if not hasattr(self.storage, "search"):
+            self.search_index = SearchIndex(os.path.join(self.index_dir, "search.log"))
+        self.sequence_file = os.path.join(self.index_dir, "sequence.json")
+        self.snapshots = SnapshotStore(self.backup_dir)
+        self.cache = NoteCache(cache_size)
+
+        # Buat direktori jika belum ada, sekaligus merapikan restore yang terhenti
+        self.storage.open()
         os.makedirs(self.backup_dir, exist_ok=True)
 
+        self._open_indexes()
+
+    def _open_indexes(self):
+        """Memuat manifest dan inverted index lalu memvalidasinya"""
+        if self.index is not None:
+            self.index.load()
+            self._sync_index()
+        if self.search_index is not None:
+            self.search_index.load()
+            self._sync_search_index()
+
+    def close(self):
+        """Menutup storage (menunggu compaction background selesai)"""
+        self.storage.close()
+
+    def _sync_index(self):
+        """Memvalidasi manifest terhadap signature storage (mtime direktori atau ukuran log)"""
+        if self.index is None:
+            return
+        os.makedirs(self.index_dir, exist_ok=True)
+        signature = self.storage.signature()
+        if signature == self.index.signature:
+            return
+
+        # Storage berubah di luar aplikasi, cocokkan ulang dengan catatan yang ada
+        stamps = self.storage.scan()
+        changed = {
+            note_id: stamp for note_id, stamp in stamps.items()
+            if self.index.entries.get(note_id, {}).get('stamp') != stamp
+        }
+
+        for note_id, note in self._map_notes(self.get_note_by_id, changed):
+            if note:
+                self._index_note(note, changed[note_id])
+
+        for note_id in set(self.index.entries) - set(stamps):
+            self._unindex_note(note_id)
+        self.index.mark(signature)
+
+    def _sync_search_index(self):
+        """Menyamakan inverted index dengan manifest"""
+        stale = {}
+        for note_id, meta in self.index.entries.items():
+            doc = self.search_index.docs.get(note_id)
+            if not (doc and doc['stamp'] == meta['stamp']):
+                stale[note_id] = meta['stamp']
+
+        for note_id, note in self._map_notes(self.get_note_by_id, stale):
+            if note:
+                self.search_index.add(note, stale[note_id])
+
+        for note_id in set(self.search_index.docs) - set(self.index.entries):
+            self.search_index.remove(note_id)
+
+    def _index_note(self, note, stamp, signature=None):
+        """Memperbarui manifest dan inverted index untuk satu catatan"""
+        if self.index is not None:
+            self.index.put(note, stamp, signature)
+        if self.search_index is not None:
+            self.search_index.add(note, stamp)
+
+    def _unindex_note(self, note_id, signature=None):
+        """Menghapus satu catatan dari manifest dan inverted index"""
+        if self.index is not None:
+            self.index.remove(note_id, signature)
+        if self.search_index is not None:
+            self.search_index.remove(note_id)
+
+    def _note_ids(self):
+        """ID semua catatan dari manifest, atau langsung dari storage jika tanpa manifest"""
+        if self.index is None:
+            return self.storage.scan()
+        self._sync_index()
+        return self.index.entries
+
+    def _query_ids(self, start=None, end=None, category=None, newest_first=True):
+        """Mengambil ID catatan dari indeks sekunder, terbaru lebih dulu"""
+        if hasattr(self.storage, "query"):
+            return self.storage.query(start, end, category, newest_first)
+        self._sync_index()
+        return self.index.query(start, end, category, newest_first)
+
+    def _page(self, note_ids, offset=0, limit=None):
+        """Memotong iterator ID sesuai offset dan limit"""
+        stop = offset + limit if limit is not None else None
+        return list(itertools.islice(note_ids, offset, stop))
+
+    def _map_notes(self, func, note_ids, chunk_size=256):
+        """Menjalankan func untuk setiap ID, paralel jika workers lebih dari satu
+
+        Hasil dikembalikan sebagai pasangan (note_id, hasil) sesuai urutan
+        selesainya, bukan urutan input. ID dikirim ke thread per potongan
+        agar overhead antrian tidak mendominasi file yang kecil.
+        """
+        note_ids = list(note_ids)
+        if self.workers <= 1 or len(note_ids) <= 1:
+            for note_id in note_ids:
+                yield note_id, func(note_id)
+            return
+
+        def run_chunk(chunk):
+            return [(note_id, func(note_id)) for note_id in chunk]
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [
+                executor.submit(run_chunk, note_ids[i:i + chunk_size])
+                for i in range(0, len(note_ids), chunk_size)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def iter_load_notes(self, note_ids):
+        """Membaca catatan satu per satu begitu selesai dibaca"""
+        for _, note in self._map_notes(self.get_note_by_id, note_ids):
+            if note:
+                yield note
+
+    def _load_notes(self, note_ids):
+        """Membaca isi catatan untuk daftar ID sesuai urutannya"""
+        if self.workers <= 1:
+            return list(self.iter_load_notes(note_ids))
+        loaded = dict(self._map_notes(self.get_note_by_id, note_ids))
+        return [loaded[note_id] for note_id in note_ids if loaded[note_id]]
+
+    def _last_sequence(self, timestamp):
+        """Mencari nomor urut terbesar untuk tanggal tertentu dari manifest atau storage"""
+        prefix = f"note_{timestamp}_"
+        last = 0
+        for note_id in self._note_ids():
+            if note_id.startswith(prefix) and note_id[len(prefix):].isdigit():
+                last = max(last, int(note_id[len(prefix):]))
+        return last
+
     def generate_note_id(self):
         """Generate ID unik untuk catatan baru"""
         timestamp = datetime.now().strftime("%Y%m%d")
-        existing_notes = len(os.listdir(self.notes_dir))
-        return f"note_{timestamp}_{existing_notes+1:03d}"
+        os.makedirs(self.index_dir, exist_ok=True)
+        with file_lock(self.sequence_file + ".lock"):
+            try:
+                with open(self.sequence_file, 'r', encoding='utf-8') as f:
+                    sequence = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                sequence = {}
+
+            # Counter hanya dipindai ulang dari manifest saat berganti hari
+            # atau file counter hilang, selebihnya alokasi O(1)
+            if sequence.get('date') == timestamp:
+                last = sequence['last']
+            else:
+                last = self._last_sequence(timestamp)
+            last += 1
+
+            # Ditulis langsung karena pembaca juga memegang lock; jika file
+            # rusak akibat crash, counter dipindai ulang dari manifest
+            with open(self.sequence_file, 'w', encoding='utf-8') as f:
+                json.dump({"date": timestamp, "last": last}, f)
+
+        return f"note_{timestamp}_{last:03d}"
 
     def create_note(self, title, category, content):
         """Membuat catatan baru"""
@@ -26,7 +207,7 @@ class NotesManager:
             raise ValueError("Kategori tidak valid!")
 
         note = {
-            "id": self.generate_note_id(),
+            "id": None,
             "title": title,
             "category": category,
             "content": content,
@@ -34,31 +215,84 @@ class NotesManager:
             "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
 
-        filename = os.path.join(self.notes_dir, f"{note['id']}.json")
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(note, f, indent=4, ensure_ascii=False)
+        # Manifest divalidasi dulu agar signature baru aman dicatat
+        self._sync_index()
+
+        # Penulisan eksklusif menolak menimpa catatan yang sudah ada, misal hasil restore
+        while True:
+            note['id'] = self.generate_note_id()
+            try:
+                stamp = self.storage.write(note, exclusive=True)
+                break
+            except FileExistsError:
+                continue
+
+        self._index_note(note, stamp, self.storage.signature())
+        self.cache.put(note, stamp)
         
         return note
 
     def get_all_notes(self):
         """Mengambil semua catatan"""
-        notes = []
-        for filename in os.listdir(self.notes_dir):
-            if filename.endswith('.json'):
-                with open(os.path.join(self.notes_dir, filename), 'r', encoding='utf-8') as f:
-                    notes.append(json.load(f))
-        return sorted(notes, key=lambda x: x['created_at'], reverse=True)
+        return self._load_notes(list(self._query_ids()))
+
+    def iter_notes(self, order="newest", offset=0, limit=None, chunk_size=50):
+        """Menghasilkan catatan satu per satu dari indeks, tanpa memuat semuanya
+
+        Hanya ID di rentang ``offset``/``limit`` yang dibaca, per potongan
+        ``chunk_size`` catatan, sehingga memori tetap terbatas berapa pun
+        jumlah catatan.
+        """
+        if order not in ("newest", "oldest"):
+            raise ValueError("Urutan tidak valid!")
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("Offset dan limit tidak boleh negatif!")
+
+        note_ids = self._query_ids(newest_first=(order == "newest"))
+        stop = offset + limit if limit is not None else None
+        note_ids = itertools.islice(note_ids, offset, stop)
+        while True:
+            chunk = list(itertools.islice(note_ids, chunk_size))
+            if not chunk:
+                return
+            yield from self._load_notes(chunk)
 
     def get_note_by_id(self, note_id):
-        """Mengambil catatan berdasarkan ID"""
-        filename = os.path.join(self.notes_dir, f"{note_id}.json")
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        """Mengambil catatan berdasarkan ID, dari cache jika stamp-nya belum berubah"""
+        # Stamp diambil sebelum membaca agar perubahan di antaranya hanya
+        # menyebabkan miss, bukan isi usang
+        stamp = self.storage.stamp(note_id)
+        if stamp is None:
+            self.cache.discard(note_id)
+            return None
+        note = self.cache.get(note_id, stamp)
+        if note is None:
+            note = self.storage.read(note_id)
+            if note:
+                self.cache.put(note, stamp)
+        return note
+
+    def cache_stats(self):
+        """Statistik cache catatan (kapasitas, isi, hit, miss)"""
+        return self.cache.stats()
 
-    def search_notes(self, keyword):
+    def compression_stats(self):
+        """Metrik kompresi (byte yang dihemat, latensi baca polos vs terkompresi)"""
+        return self.codec.stats()
+
+    def search_notes(self, keyword, mode="index"):
         """Mencari catatan berdasarkan kata kunci"""
+        if mode not in ("index", "substring"):
+            raise ValueError("Mode pencarian tidak valid!")
+
+        # Mode index memakai inverted index dengan hasil berperingkat dan
+        # pencocokan prefix; mode substring memindai semua catatan
+        if mode == "index" and tokenize(keyword):
+            if self.search_index is None:
+                return self._load_notes(self.storage.search(tokenize(keyword)))
+            self._sync_index()
+            return self._load_notes(self.search_index.search(keyword))
+
         notes = self.get_all_notes()
         keyword = keyword.lower()
         return [
@@ -69,22 +303,37 @@ class NotesManager:
 
     def get_notes_by_date(self, date_str):
         """Mengambil catatan berdasarkan tanggal"""
-        notes = self.get_all_notes()
-        return [
-            note for note in notes
-            if note['created_at'].startswith(date_str)
-        ]
+        return self._load_notes(list(self._query_ids(date_str, date_str)))
+
+    def _check_filter(self, start_date, end_date, category):
+        """Memvalidasi filter rentang tanggal dan kategori"""
+        if category is not None and category not in self.categories:
+            raise ValueError("Kategori tidak valid!")
+        # Bandingkan sepanjang end agar "2025-11" tetap mencakup "2025-11-08"
+        if start_date and end_date and end_date < start_date[:len(end_date)]:
+            raise ValueError("Tanggal akhir tidak boleh sebelum tanggal awal!")
+
+    def get_notes_by_date_range(self, start_date, end_date, category=None,
+                                offset=0, limit=None):
+        """Mengambil catatan dalam rentang tanggal (inklusif), bisa per kategori dan per halaman"""
+        self._check_filter(start_date, end_date, category)
+        note_ids = self._query_ids(start_date, end_date, category)
+        return self._load_notes(self._page(note_ids, offset, limit))
+
+    def count_notes(self, start_date=None, end_date=None, category=None):
+        """Menghitung catatan yang cocok dengan filter tanpa membuka isinya"""
+        self._check_filter(start_date, end_date, category)
+        if hasattr(self.storage, "count"):
+            return self.storage.count(start_date, end_date, category)
+        self._sync_index()
+        return self.index.count(start_date, end_date, category)
 
     def get_notes_by_category(self, category):
         """Mengambil catatan berdasarkan kategori"""
         if category not in self.categories:
             raise ValueError("Kategori tidak valid!")
         
-        notes = self.get_all_notes()
-        return [
-            note for note in notes
-            if note['category'] == category
-        ]
+        return self._load_notes(list(self._query_ids(category=category)))
 
     def update_note(self, note_id, title=None, category=None, content=None):
         """Mengupdate catatan yang ada"""
@@ -104,60 +353,123 @@ class NotesManager:
 
         note['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        filename = os.path.join(self.notes_dir, f"{note_id}.json")
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(note, f, indent=4, ensure_ascii=False)
+        self._sync_index()
+        stamp = self.storage.write(note)
+        self._index_note(note, stamp, self.storage.signature())
+        self.cache.put(note, stamp)
         
         return note
 
     def delete_note(self, note_id):
         """Menghapus catatan"""
-        filename = os.path.join(self.notes_dir, f"{note_id}.json")
-        if os.path.exists(filename):
-            os.remove(filename)
+        self._sync_index()
+        self.cache.discard(note_id)
+        if self.storage.delete(note_id):
+            self._unindex_note(note_id, self.storage.signature())
             return True
         return False
 
-    def create_backup(self):
+    def create_backup(self, incremental=False):
         """Membuat backup dari semua catatan"""
+        if incremental:
+            return self._create_snapshot()
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_filename = os.path.join(self.backup_dir, f"backup_{timestamp}.zip")
         
-        if os.listdir(self.notes_dir):
-            shutil.make_archive(backup_filename[:-4], 'zip', self.notes_dir)
+        # Hanya catatan yang di-backup, manifest bisa dibangun ulang
+        note_ids = list(self._note_ids())
+        if note_ids:
+            with zipfile.ZipFile(backup_filename, 'w', zipfile.ZIP_DEFLATED) as zf:
+                for note_id in note_ids:
+                    data = self.storage.read_raw(note_id)
+                    if data is not None:
+                        zf.writestr(f"{note_id}.json", data)
             return backup_filename
         return None
 
-    def restore_backup(self, backup_file):
+    def _create_snapshot(self):
+        """Membuat snapshot incremental yang hanya menyimpan catatan yang berubah"""
+        # Stamp diambil langsung dari storage, bukan dari manifest, agar file
+        # yang disunting di tempat (mtime direktori tetap) ikut terdeteksi
+        stamps = self.storage.scan()
+        if not stamps:
+            return None
+
+        # Catatan dengan stamp yang sama dengan snapshot terakhir memakai
+        # hash lama tanpa dibaca ulang
+        previous = self.snapshots.latest_notes()
+        notes = {}
+        for note_id, stamp in stamps.items():
+            entry = previous.get(note_id)
+            if entry and entry[1:] == stamp:
+                notes[note_id] = entry
+                continue
+            data = self.storage.read_raw(note_id)
+            if data is not None:
+                notes[note_id] = [self.snapshots.write_object(data)] + stamp
+
+        return self.snapshots.save(notes)
+
+    def _read_snapshot(self, snapshot_file):
+        """Membaca isi catatan dari snapshot satu per satu"""
+        notes = self.snapshots.load(snapshot_file)['notes']
+        for note_id, entry in notes.items():
+            yield note_id, self.snapshots.read_object(entry[0]), len(notes)
+
+    def _read_zip(self, backup_file):
+        """Mengalirkan isi catatan dari arsip zip satu per satu"""
+        with zipfile.ZipFile(backup_file) as zf:
+            members = [
+                info for info in zf.infolist()
+                if not info.is_dir() and info.filename.endswith('.json')
+            ]
+            for info in members:
+                # Hanya nama file yang dipakai agar entri tidak keluar dari staging
+                note_id = os.path.basename(info.filename)[:-5]
+                yield note_id, zf.read(info), len(members)
+
+    def list_backups(self):
+        """Mengambil daftar file backup zip dan snapshot"""
+        snapshots = set(self.snapshots.list_snapshots())
+        return sorted(
+            f for f in os.listdir(self.backup_dir)
+            if f.endswith('.zip') or f in snapshots
+        )
+
+    def restore_backup(self, backup_file, progress=None):
         """Memulihkan catatan dari file backup"""
         if not os.path.exists(backup_file):
             raise ValueError("File backup tidak ditemukan!")
 
-        # Buat direktori temporary untuk ekstraksi
-        temp_dir = os.path.join(self.backup_dir, "temp")
-        os.makedirs(temp_dir, exist_ok=True)
+        # Counter ID disimpan agar ID yang pernah dipakai tidak terulang
+        sequence = None
+        if os.path.exists(self.sequence_file):
+            with open(self.sequence_file, 'rb') as f:
+                sequence = f.read()
 
+        # Catatan ditulis ke staging, data aktif tidak disentuh sampai selesai
+        staging = self.storage.begin_restore()
         try:
-            # Ekstrak backup
-            shutil.unpack_archive(backup_file, temp_dir)
-            
-            # Hapus catatan yang ada
-            for file in os.listdir(self.notes_dir):
-                os.remove(os.path.join(self.notes_dir, file))
-            
-            # Pindahkan file dari backup
-            for file in os.listdir(temp_dir):
-                shutil.move(
-                    os.path.join(temp_dir, file),
-                    os.path.join(self.notes_dir, file)
-                )
-            
-            return True
-            
+            if backup_file.endswith('.json'):
+                entries = self._read_snapshot(backup_file)
+            else:
+                entries = self._read_zip(backup_file)
+            for done, (note_id, data, total) in enumerate(entries, 1):
+                self.storage.put_restore(staging, note_id, data)
+                if progress:
+                    progress(done, total)
+            self.storage.commit_restore(staging)
+            self.cache.clear()
+
         except Exception as e:
+            self.storage.abort_restore(staging)
             raise Exception(f"Gagal memulihkan backup: {str(e)}")
-        
-        finally:
-            # Bersihkan direktori temporary
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
\ No newline at end of file
+
+        if sequence is not None:
+            os.makedirs(self.index_dir, exist_ok=True)
+            with open(self.sequence_file, 'wb') as f:
+                f.write(sequence)
+
+        self._open_indexes()
+        return True
@@ -0,0 +1,107 @@
+import bisect
+import math
+import re
+from note_index import LogIndex
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+def tokenize(text):
+    """Memecah teks menjadi token huruf kecil"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+class SearchIndex(LogIndex):
+    TITLE_WEIGHT = 3
+
+    def reset(self):
+        """Mengosongkan inverted index di memori"""
+        self.postings = {}
+        self.docs = {}
+        self.vocabulary = None
+
+    def __len__(self):
+        return len(self.docs)
+
+    def _loaded(self):
+        """Menyusun kosakata terurut setelah inverted index dimuat"""
+        self.vocabulary = sorted(self.postings)
+
+    def _apply(self, record):
+        """Menerapkan satu record log ke inverted index di memori"""
+        self._remove_postings(record['id'])
+        if record['op'] == 'put':
+            self.docs[record['id']] = {"stamp": record['stamp'], "terms": record['terms']}
+            for token, weight in record['terms'].items():
+                postings = self.postings.get(token)
+                if postings is None:
+                    postings = self.postings[token] = {}
+                    if self.vocabulary is not None:
+                        bisect.insort(self.vocabulary, token)
+                postings[record['id']] = weight
+
+    def _remove_postings(self, note_id):
+        """Menghapus semua posting milik satu catatan"""
+        doc = self.docs.pop(note_id, None)
+        if not doc:
+            return
+        for token in doc['terms']:
+            postings = self.postings[token]
+            del postings[note_id]
+            if not postings:
+                del self.postings[token]
+                if self.vocabulary is not None:
+                    del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+
+    def _snapshot(self):
+        """Menghasilkan record put untuk setiap catatan terindeks"""
+        for note_id, doc in self.docs.items():
+            yield {"op": "put", "id": note_id, "stamp": doc['stamp'], "terms": doc['terms']}
+
+    def add(self, note, stamp):
+        """Mengindeks judul dan isi catatan"""
+        terms = {}
+        for token in tokenize(note['title']):
+            terms[token] = terms.get(token, 0) + self.TITLE_WEIGHT
+        for token in tokenize(note['content']):
+            terms[token] = terms.get(token, 0) + 1
+        self._append({"op": "put", "id": note['id'], "stamp": stamp, "terms": terms})
+
+    def remove(self, note_id):
+        """Menghapus catatan dari inverted index"""
+        if note_id in self.docs:
+            self._append({"op": "del", "id": note_id})
+
+    def expand(self, prefix):
+        """Mencari semua token yang diawali prefix"""
+        position = bisect.bisect_left(self.vocabulary, prefix)
+        tokens = []
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(prefix):
+            tokens.append(self.vocabulary[position])
+            position += 1
+        return tokens
+
+    def search(self, query):
+        """Mencari ID catatan yang memuat semua kata kunci, diurutkan berdasarkan skor"""
+        total = len(self.docs)
+        scores = None
+        for prefix in set(tokenize(query)):
+            matches = {}
+            for token in self.expand(prefix):
+                postings = self.postings[token]
+                idf = math.log(1 + total / len(postings))
+                for note_id, weight in postings.items():
+                    matches[note_id] = matches.get(note_id, 0) + weight * idf
+
+            if scores is None:
+                scores = matches
+            else:
+                scores = {
+                    note_id: score + matches[note_id]
+                    for note_id, score in scores.items()
+                    if note_id in matches
+                }
+            if not scores:
+                return []
+
+        if scores is None:
+            return []
+        return sorted(scores, key=lambda note_id: (-scores[note_id], note_id))
@@ -0,0 +1,66 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+class SnapshotStore:
+    def __init__(self, backup_dir):
+        """Inisialisasi penyimpanan backup incremental berbasis hash isi"""
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, "objects")
+
+    def _object_path(self, digest):
+        """Path file object untuk hash tertentu"""
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def list_snapshots(self):
+        """Mengambil daftar file snapshot, terlama lebih dulu"""
+        if not os.path.exists(self.backup_dir):
+            return []
+        return sorted(
+            f for f in os.listdir(self.backup_dir)
+            if f.startswith("snapshot_") and f.endswith(".json")
+        )
+
+    def load(self, snapshot_file):
+        """Membaca manifest snapshot"""
+        with open(snapshot_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def latest_notes(self):
+        """Mengambil daftar catatan dari snapshot terakhir"""
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            return {}
+        return self.load(os.path.join(self.backup_dir, snapshots[-1]))['notes']
+
+    def write_object(self, data):
+        """Menyimpan isi file catatan sekali per hash, mengembalikan hash-nya"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return digest
+
+    def read_object(self, digest):
+        """Membaca isi file catatan berdasarkan hash"""
+        with open(self._object_path(digest), 'rb') as f:
+            return f.read()
+
+    def save(self, notes):
+        """Menulis manifest snapshot baru"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        snapshot_file = os.path.join(self.backup_dir, f"snapshot_{timestamp}.json")
+        snapshot = {
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "notes": notes
+        }
+        temp_path = snapshot_file + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(temp_path, snapshot_file)
+        return snapshot_file
@@ -2,8 +2,14 @@ import unittest
 import os
 import shutil
 import json
+import subprocess
+import sys
+import threading
+import zipfile
 from datetime import datetime
 from notes_manager import NotesManager
+from benchmark_notes import compare_results, generate_notes, run_suite
+from note_storage import JsonNoteStorage, PackedNoteStorage, SqliteNoteStorage, migrate_notes
 
 class TestNotesManager(unittest.TestCase):
     def setUp(self):
@@ -58,6 +64,51 @@ class TestNotesManager(unittest.TestCase):
         self.assertIn(note1['id'], [n['id'] for n in notes])
         self.assertIn(note2['id'], [n['id'] for n in notes])
 
+    def test_iter_notes_pagination(self):
+        """Test lazy paging over notes in both orders"""
+        ids = [
+            self.manager.create_note(f"Note {i}", "Personal", "Content")['id']
+            for i in range(5)
+        ]
+
+        self.assertEqual([n['id'] for n in self.manager.iter_notes()], ids[::-1])
+        self.assertEqual(
+            [n['id'] for n in self.manager.iter_notes(order="oldest", offset=1, limit=2)],
+            ids[1:3]
+        )
+        self.assertEqual(
+            [n['id'] for n in self.manager.iter_notes(offset=3, limit=10)],
+            [ids[1], ids[0]]
+        )
+
+        # Only the requested page is read from storage
+        loaded = []
+        read = self.manager.get_note_by_id
+        self.manager.get_note_by_id = lambda note_id: loaded.append(note_id) or read(note_id)
+        page = self.manager.iter_notes(limit=2, chunk_size=1)
+        self.assertEqual(loaded, [])
+        next(page)
+        self.assertEqual(loaded, [ids[4]])
+        list(page)
+        self.assertEqual(loaded, [ids[4], ids[3]])
+
+        with self.assertRaises(ValueError):
+            list(self.manager.iter_notes(order="random"))
+
+    def test_iter_notes_while_deleting(self):
+        """Test deleting every note while iterating over them in chunks"""
+        ids = [
+            self.manager.create_note(f"Note {i}", "Personal", "Content")['id']
+            for i in range(12)
+        ]
+
+        seen = []
+        for note in self.manager.iter_notes(order="oldest", chunk_size=5):
+            seen.append(note['id'])
+            self.manager.delete_note(note['id'])
+        self.assertEqual(seen, ids)
+        self.assertEqual(self.manager.count_notes(), 0)
+
     def test_search_notes(self):
         """Test searching notes"""
         self.manager.create_note(
@@ -81,6 +132,75 @@ class TestNotesManager(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]['title'], "Shopping List")
 
+    def test_search_ranking_and_prefix(self):
+        """Test ranked index search with prefix matching"""
+        in_content = self.manager.create_note(
+            "Weekly Report", "Pekerjaan", "Prepare the meeting agenda"
+        )
+        in_title = self.manager.create_note(
+            "Meeting Minutes", "Pekerjaan", "Summary of decisions"
+        )
+        self.manager.create_note("Shopping", "Personal", "Buy milk")
+
+        results = self.manager.search_notes("meet")
+        self.assertEqual(
+            [n['id'] for n in results],
+            [in_title['id'], in_content['id']]
+        )
+
+        # All keywords must match
+        results = self.manager.search_notes("meeting agenda")
+        self.assertEqual([n['id'] for n in results], [in_content['id']])
+
+    def test_search_substring_mode(self):
+        """Test substring fallback search mode"""
+        self.manager.create_note("Meeting Notes", "Pekerjaan", "Timeline")
+
+        self.assertEqual(self.manager.search_notes("eet"), [])
+        results = self.manager.search_notes("eet", mode="substring")
+        self.assertEqual(len(results), 1)
+
+        with self.assertRaises(ValueError):
+            self.manager.search_notes("eet", mode="invalid")
+
+    def test_search_index_follows_changes(self):
+        """Test that updates and deletes are reflected in search results"""
+        note = self.manager.create_note("Draft", "Ide", "Rocket design")
+        self.manager.update_note(note['id'], content="Bicycle design")
+
+        new_manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertEqual(new_manager.search_notes("rocket"), [])
+        self.assertEqual(len(new_manager.search_notes("bicycle")), 1)
+
+        new_manager.delete_note(note['id'])
+        self.assertEqual(new_manager.search_notes("bicycle"), [])
+
+    def test_note_cache(self):
+        """Test LRU caching of notes and invalidation on external edits"""
+        manager = NotesManager(self.test_notes_dir, self.test_backup_dir, cache_size=2)
+        notes = [manager.create_note(f"Note {i}", "Ide", "Cached") for i in range(3)]
+
+        first = manager.get_note_by_id(notes[2]['id'])
+        first['title'] = "Changed by caller"
+        self.assertEqual(manager.get_note_by_id(notes[2]['id'])['title'], "Note 2")
+        self.assertEqual(manager.cache_stats()['hits'], 2)
+
+        # Only the two most recently used notes are kept
+        self.assertEqual(manager.cache_stats()['size'], 2)
+        manager.get_note_by_id(notes[0]['id'])
+        self.assertEqual(manager.cache_stats()['misses'], 1)
+
+        path = os.path.join(self.test_notes_dir, f"{notes[0]['id']}.json")
+        edited = dict(notes[0], content="Edited outside the app")
+        with open(path, 'w') as f:
+            json.dump(edited, f)
+        self.assertEqual(
+            manager.get_note_by_id(notes[0]['id'])['content'], "Edited outside the app"
+        )
+
+        os.remove(path)
+        self.assertIsNone(manager.get_note_by_id(notes[0]['id']))
+
     def test_update_note(self):
         """Test updating a note"""
         note = self.manager.create_note(
@@ -120,6 +240,60 @@ class TestNotesManager(unittest.TestCase):
             os.path.join(self.test_notes_dir, f"{note['id']}.json")
         ))
 
+    def test_note_id_not_reused_after_delete(self):
+        """Test that deleting a note does not cause ID collisions"""
+        note1 = self.manager.create_note("Note 1", "Personal", "Content 1")
+        note2 = self.manager.create_note("Note 2", "Personal", "Content 2")
+        self.manager.delete_note(note1['id'])
+
+        note3 = self.manager.create_note("Note 3", "Personal", "Content 3")
+        self.assertNotIn(note3['id'], [note1['id'], note2['id']])
+        self.assertEqual(self.manager.get_note_by_id(note2['id'])['title'], "Note 2")
+
+    def test_note_id_sequence_persisted(self):
+        """Test that the ID counter continues across manager instances"""
+        note1 = self.manager.create_note("Note 1", "Personal", "Content 1")
+        new_manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        note2 = new_manager.create_note("Note 2", "Personal", "Content 2")
+
+        self.assertEqual(int(note2['id'][-3:]), int(note1['id'][-3:]) + 1)
+
+    def test_concurrent_note_creation(self):
+        """Test that separate managers never allocate the same ID"""
+        managers = [
+            NotesManager(self.test_notes_dir, self.test_backup_dir)
+            for _ in range(4)
+        ]
+        created = []
+
+        def worker(manager):
+            for i in range(10):
+                created.append(manager.create_note(f"Note {i}", "Ide", "Content")['id'])
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(set(created)), 40)
+        self.assertEqual(len(self.manager.get_all_notes()), 40)
+
+    def test_parallel_loading(self):
+        """Test that the thread pool loader returns the same notes in order"""
+        for i in range(20):
+            self.manager.create_note(f"Note {i}", "Ide", f"Content {i}")
+        shutil.rmtree(os.path.join(self.test_notes_dir, ".index"))
+
+        parallel = NotesManager(self.test_notes_dir, self.test_backup_dir, workers=4)
+        self.assertEqual(len(parallel.index.entries), 20)
+        self.assertEqual(
+            [n['id'] for n in parallel.get_all_notes()],
+            [n['id'] for n in self.manager.get_all_notes()]
+        )
+        loaded = list(parallel.iter_load_notes(list(parallel.index.entries)))
+        self.assertEqual(len(loaded), 20)
+
     def test_backup_restore(self):
         """Test backup and restore functionality"""
         # Create some notes
@@ -142,6 +316,87 @@ class TestNotesManager(unittest.TestCase):
         notes = self.manager.get_all_notes()
         self.assertEqual(len(notes), 2)
 
+    def test_restore_progress_and_cleanup(self):
+        """Test that restore reports progress and leaves no staging files"""
+        self.manager.create_note("Note 1", "Personal", "Content 1")
+        self.manager.create_note("Note 2", "Pekerjaan", "Content 2")
+        backup_file = self.manager.create_backup()
+        self.manager.create_note("Note 3", "Ide", "Content 3")
+
+        progress = []
+        self.manager.restore_backup(backup_file, progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(progress, [(1, 2), (2, 2)])
+        self.assertEqual(len(self.manager.get_all_notes()), 2)
+        self.assertFalse(os.path.exists(self.test_notes_dir + ".staging"))
+        self.assertFalse(os.path.exists(self.test_notes_dir + ".old"))
+
+    def test_failed_restore_keeps_notes(self):
+        """Test that a broken backup leaves current notes untouched"""
+        note = self.manager.create_note("Keep Me", "Personal", "Content")
+        broken = os.path.join(self.test_backup_dir, "broken.zip")
+        with open(broken, 'w') as f:
+            f.write("not a zip file")
+
+        with self.assertRaises(Exception):
+            self.manager.restore_backup(broken)
+        self.assertIsNotNone(self.manager.get_note_by_id(note['id']))
+        self.assertFalse(os.path.exists(self.test_notes_dir + ".staging"))
+
+    def test_interrupted_restore_recovered(self):
+        """Test recovery when a restore stopped between the two renames"""
+        note = self.manager.create_note("Survivor", "Personal", "Content")
+        os.rename(self.test_notes_dir, self.test_notes_dir + ".old")
+
+        manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertEqual([n['id'] for n in manager.get_all_notes()], [note['id']])
+        self.assertFalse(os.path.exists(self.test_notes_dir + ".old"))
+
+    def test_incremental_backup(self):
+        """Test that incremental backups only store changed notes"""
+        note1 = self.manager.create_note("Note 1", "Personal", "Content 1")
+        self.manager.create_note("Note 2", "Pekerjaan", "Content 2")
+
+        first = self.manager.create_backup(incremental=True)
+        objects_dir = os.path.join(self.test_backup_dir, "objects")
+        count_objects = lambda: sum(len(files) for _, _, files in os.walk(objects_dir))
+        self.assertEqual(count_objects(), 2)
+
+        self.manager.update_note(note1['id'], content="Changed content")
+        second = self.manager.create_backup(incremental=True)
+        self.assertEqual(count_objects(), 3)
+        self.assertEqual(
+            self.manager.list_backups(),
+            sorted([os.path.basename(first), os.path.basename(second)])
+        )
+
+        # Setiap snapshot bisa dipulihkan ke kondisinya masing-masing
+        self.assertTrue(self.manager.restore_backup(first))
+        self.assertEqual(self.manager.get_note_by_id(note1['id'])['content'], "Content 1")
+        self.assertTrue(self.manager.restore_backup(second))
+        self.assertEqual(
+            self.manager.get_note_by_id(note1['id'])['content'], "Changed content"
+        )
+        self.assertEqual(len(self.manager.get_all_notes()), 2)
+
+    def test_incremental_backup_detects_in_place_edit(self):
+        """Test that a note edited in place outside the app is snapshotted again"""
+        note = self.manager.create_note("Note", "Personal", "Original")
+        self.manager.create_backup(incremental=True)
+
+        # Overwrite the file directly; the directory mtime does not change
+        path = os.path.join(self.test_notes_dir, f"{note['id']}.json")
+        edited = dict(note, content="Edited outside the app")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(edited, f)
+        second = self.manager.create_backup(incremental=True)
+
+        self.manager.delete_note(note['id'])
+        self.assertTrue(self.manager.restore_backup(second))
+        self.assertEqual(
+            self.manager.get_note_by_id(note['id'])['content'], "Edited outside the app"
+        )
+
     def test_get_notes_by_date(self):
         """Test retrieving notes by date"""
         today = datetime.now().strftime("%Y-%m-%d")
@@ -168,5 +423,469 @@ class TestNotesManager(unittest.TestCase):
         self.assertEqual(len(personal_notes), 2)
         self.assertEqual(len(work_notes), 1)
 
+    def test_manifest_persisted(self):
+        """Test that the note manifest is reused by a new manager"""
+        note = self.manager.create_note("Indexed", "Ide", "Indexed content")
+
+        new_manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertIn(note['id'], new_manager.index.entries)
+        self.assertEqual(new_manager.index.entries[note['id']]['title'], "Indexed")
+        self.assertEqual(
+            new_manager.index.signature,
+            os.stat(self.test_notes_dir).st_mtime_ns
+        )
+
+    def test_manifest_recovers_from_torn_line(self):
+        """Test that a torn manifest line is cut off so later records persist"""
+        first = self.manager.create_note("First", "Ide", "Content")
+        manifest = self.manager.index.path
+        with open(manifest, 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "id": "note_torn"')
+        size = os.path.getsize(manifest)
+
+        manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertLess(os.path.getsize(manifest), size)
+        second = manager.create_note("Second", "Ide", "Content")
+
+        # The next manager reads both notes from the manifest without rescanning
+        reopened = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertEqual(set(reopened.index.entries), {first['id'], second['id']})
+        self.assertEqual(reopened.index.signature, os.stat(self.test_notes_dir).st_mtime_ns)
+        self.assertEqual(reopened.cache_stats()['misses'], 0)
+
+    def test_manifest_compaction_keeps_other_writers(self):
+        """Test that compacting the manifest keeps records appended by another manager"""
+        other = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        mine = self.manager.create_note("Mine", "Ide", "Content")
+        theirs = other.create_note("Theirs", "Ide", "Content")
+
+        self.manager.index.compact()
+        self.assertEqual(set(self.manager.index.entries), {mine['id'], theirs['id']})
+        self.assertEqual(
+            [f for f in os.listdir(self.manager.index_dir) if ".compact." in f or f.endswith(".tmp")],
+            []
+        )
+        reopened = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        self.assertEqual(set(reopened.index.entries), {mine['id'], theirs['id']})
+
+    def test_manifest_detects_external_changes(self):
+        """Test that notes added or removed outside the app are picked up"""
+        note = self.manager.create_note("Note 1", "Personal", "Content 1")
+
+        external = {
+            "id": "note_20250101_001",
+            "title": "External",
+            "category": "Ide",
+            "content": "Written by another tool",
+            "created_at": "2025-01-01 09:00:00",
+            "updated_at": "2025-01-01 09:00:00"
+        }
+        with open(os.path.join(self.test_notes_dir, "note_20250101_001.json"), 'w') as f:
+            json.dump(external, f)
+        os.remove(os.path.join(self.test_notes_dir, f"{note['id']}.json"))
+
+        notes = self.manager.get_all_notes()
+        self.assertEqual([n['id'] for n in notes], ["note_20250101_001"])
+        self.assertEqual(len(self.manager.get_notes_by_category("Ide")), 1)
+
+    def _write_dated_note(self, note_id, category, created_at):
+        """Write a note file with a fixed creation time"""
+        note = {
+            "id": note_id,
+            "title": note_id,
+            "category": category,
+            "content": "Dated content",
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+        with open(os.path.join(self.test_notes_dir, f"{note_id}.json"), 'w') as f:
+            json.dump(note, f)
+
+    def test_date_range_and_category_filters(self):
+        """Test range queries, combined filters, paging and counts"""
+        self._write_dated_note("note_20251030_001", "Personal", "2025-10-30 08:00:00")
+        self._write_dated_note("note_20251103_001", "Pekerjaan", "2025-11-03 09:00:00")
+        self._write_dated_note("note_20251105_001", "Personal", "2025-11-05 10:00:00")
+        self._write_dated_note("note_20251109_001", "Personal", "2025-11-09 11:00:00")
+        self._write_dated_note("note_20251201_001", "Ide", "2025-12-01 12:00:00")
+
+        month = self.manager.get_notes_by_date_range("2025-11", "2025-11")
+        self.assertEqual(
+            [n['id'] for n in month],
+            ["note_20251109_001", "note_20251105_001", "note_20251103_001"]
+        )
+        self.assertEqual(len(self.manager.get_notes_by_date("2025-11")), 3)
+
+        week = self.manager.get_notes_by_date_range("2025-11-03", "2025-11-09", "Personal")
+        self.assertEqual(
+            [n['id'] for n in week],
+            ["note_20251109_001", "note_20251105_001"]
+        )
+
+        page = self.manager.get_notes_by_date_range(
+            "2025-10-01", "2025-12-31", offset=1, limit=2
+        )
+        self.assertEqual(
+            [n['id'] for n in page],
+            ["note_20251109_001", "note_20251105_001"]
+        )
+
+        self.assertEqual(self.manager.count_notes(), 5)
+        self.assertEqual(self.manager.count_notes("2025-11", "2025-11", "Personal"), 2)
+        self.assertEqual(self.manager.count_notes(category="Ide"), 1)
+
+        self.manager.delete_note("note_20251105_001")
+        self.assertEqual(self.manager.count_notes("2025-11", "2025-11", "Personal"), 1)
+
+        with self.assertRaises(ValueError):
+            self.manager.get_notes_by_date_range("2025-11-01", "2025-11-30", "Invalid")
+        with self.assertRaises(ValueError):
+            self.manager.get_notes_by_date_range("2025-11-09", "2025-11-03")
+
+    def test_compressed_notes(self):
+        """Test that large notes are compressed and read back transparently"""
+        manager = NotesManager(
+            self.test_notes_dir, self.test_backup_dir,
+            compression="zlib", compress_threshold=200
+        )
+        long_note = manager.create_note("Long", "Ide", "Repeated paragraph. " * 100)
+        short_note = manager.create_note("Short", "Ide", "Tiny")
+
+        with open(os.path.join(self.test_notes_dir, f"{long_note['id']}.json"), 'rb') as f:
+            self.assertEqual(f.read(1), b"\x78")
+        with open(os.path.join(self.test_notes_dir, f"{short_note['id']}.json"), 'r') as f:
+            self.assertEqual(json.load(f)['content'], "Tiny")
+
+        stats = manager.compression_stats()
+        self.assertEqual(stats['compressed'], 1)
+        self.assertGreater(stats['bytes_saved'], 1000)
+
+        # A manager without compression still reads compressed notes
+        reader = NotesManager(self.test_notes_dir, self.test_backup_dir, cache_size=0)
+        self.assertEqual(reader.get_note_by_id(long_note['id']), long_note)
+        self.assertEqual(len(reader.search_notes("paragraph")), 1)
+        self.assertGreater(reader.compression_stats()['reads_compressed'], 0)
+
+        backup_file = manager.create_backup()
+        manager.delete_note(long_note['id'])
+        manager.restore_backup(backup_file)
+        self.assertEqual(manager.get_note_by_id(long_note['id'])['content'], long_note['content'])
+
+        with self.assertRaises(ValueError):
+            NotesManager(self.test_notes_dir, self.test_backup_dir, compression="bz2")
+
+    def test_benchmark_suite(self):
+        """Test that the benchmark harness produces comparable results"""
+        notes = list(generate_notes(50, self.manager.categories, seed=1))
+        self.assertEqual(len({n['id'] for n in notes}), 50)
+        self.assertEqual(notes, list(generate_notes(50, self.manager.categories, seed=1)))
+
+        bench_dir = "test_bench"
+        try:
+            results = run_suite(bench_dir, 50, ops=5, repeat=1)
+        finally:
+            shutil.rmtree(bench_dir, ignore_errors=True)
+        names = [r['name'] for r in results]
+        for name in ("create", "get_all", "search", "filter_month", "backup_full", "restore"):
+            self.assertIn(name, names)
+
+        slower = [dict(r, seconds=r['seconds'] * 10 + 1) for r in results]
+        self.assertEqual(len(compare_results(slower, {"results": results})), len(results))
+        self.assertEqual(compare_results(results, {"results": results}), [])
+
+class TestPackedNotesManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with the packed storage backend"""
+        self.test_notes_dir = "test_notes"
+        self.test_backup_dir = "test_backup"
+        self.manager = NotesManager(
+            self.test_notes_dir, self.test_backup_dir, storage="packed"
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.close()
+        if os.path.exists(self.test_notes_dir):
+            shutil.rmtree(self.test_notes_dir)
+        if os.path.exists(self.test_backup_dir):
+            shutil.rmtree(self.test_backup_dir)
+
+    def test_crud_in_single_file(self):
+        """Test that notes live in one log file and support CRUD"""
+        note = self.manager.create_note("Packed", "Ide", "Stored in a log")
+        self.manager.update_note(note['id'], title="Packed v2")
+
+        files = [f for f in os.listdir(self.test_notes_dir) if f.endswith('.json')]
+        self.assertEqual(files, [])
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['title'], "Packed v2")
+        self.assertEqual(len(self.manager.search_notes("log")), 1)
+
+        self.assertTrue(self.manager.delete_note(note['id']))
+        self.assertIsNone(self.manager.get_note_by_id(note['id']))
+        self.assertFalse(self.manager.delete_note(note['id']))
+
+    def test_reopen_and_truncated_tail(self):
+        """Test that a reopened store ignores a half-written record"""
+        note = self.manager.create_note("Durable", "Personal", "Content")
+        self.manager.close()
+        with open(self.manager.storage.path, 'ab') as f:
+            f.write(b"PUT note_x 500 99\n{\"partial")
+
+        manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        self.assertEqual([n['id'] for n in manager.get_all_notes()], [note['id']])
+        self.assertIsNone(manager.get_note_by_id("note_x"))
+        manager.create_note("After crash", "Ide", "Still readable")
+        self.assertEqual(len(manager.get_all_notes()), 2)
+        manager.close()
+
+    def test_sees_writes_from_another_instance(self):
+        """Test that reads follow the log when another manager appends to it"""
+        other = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        note = other.create_note("Shared", "Ide", "v1")
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], "v1")
+
+        other.update_note(note['id'], content="v2")
+        self.manager.update_note(note['id'], title="Renamed")
+        stored = other.get_note_by_id(note['id'])
+        self.assertEqual((stored['title'], stored['content']), ("Renamed", "v2"))
+        other.close()
+
+    def test_compaction_drops_superseded_records(self):
+        """Test that compaction keeps only the latest version of each note"""
+        note = self.manager.create_note("Versioned", "Ide", "v0")
+        for i in range(1, 20):
+            self.manager.update_note(note['id'], content=f"v{i}")
+        storage = self.manager.storage
+        size_before = os.path.getsize(storage.path)
+        stamp_before = storage.stamp(note['id'])
+
+        storage.compact()
+        self.assertLess(os.path.getsize(storage.path), size_before)
+        self.assertEqual(storage.dead_bytes, 0)
+        self.assertEqual(storage.stamp(note['id']), stamp_before)
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], "v19")
+
+    def test_background_compaction(self):
+        """Test that heavy overwrites trigger compaction in a background thread"""
+        storage = self.manager.storage
+        storage.COMPACT_MIN_BYTES = 0
+        note = self.manager.create_note("Busy", "Ide", "start")
+        for i in range(10):
+            self.manager.update_note(note['id'], content=f"edit {i}")
+
+        self.assertIsNotNone(storage._compactor)
+        storage._compactor.join()
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], "edit 9")
+        self.assertLess(storage.dead_bytes, storage.live_bytes * 2)
+
+    def test_backup_restore(self):
+        """Test backup and restore with the packed backend"""
+        self.manager.create_note("Note 1", "Personal", "Content 1")
+        backup_file = self.manager.create_backup()
+        self.manager.create_note("Note 2", "Pekerjaan", "Content 2")
+
+        self.assertTrue(self.manager.restore_backup(backup_file))
+        notes = self.manager.get_all_notes()
+        self.assertEqual([n['title'] for n in notes], ["Note 1"])
+        self.assertEqual(
+            sorted(os.listdir(self.test_notes_dir)), [".index", "notes.pack", "notes.pack.lock"]
+        )
+
+    def test_ids_with_whitespace_are_rejected(self):
+        """Test that an ID which would break the record header never reaches the log"""
+        note = self.manager.create_note("Keep", "Personal", "Content")
+        backup_file = os.path.join(self.test_backup_dir, "spaces.zip")
+        with zipfile.ZipFile(backup_file, 'w') as zf:
+            for note_id in ("note_20250101_001", "my note", "note_20250101_003"):
+                zf.writestr(f"{note_id}.json", json.dumps(dict(note, id=note_id)))
+
+        with self.assertRaises(Exception):
+            self.manager.restore_backup(backup_file)
+        with self.assertRaises(ValueError):
+            self.manager.storage.write(dict(note, id="bad\nid"))
+
+        self.manager.close()
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        self.assertEqual([n['id'] for n in self.manager.get_all_notes()], [note['id']])
+
+    def test_leftovers_of_live_processes_are_kept(self):
+        """Test that reopening only removes temp files of processes that have exited"""
+        self.manager.close()
+        finished = subprocess.Popen([sys.executable, "-c", "pass"])
+        finished.wait()
+        path = self.manager.storage.path
+        live = [f"{path}.compact.{os.getpid()}", f"{path}.staging.{os.getppid()}"]
+        dead = [f"{path}.compact.{finished.pid}", f"{path}.staging.{finished.pid}"]
+        for leftover in live + dead:
+            open(leftover, 'wb').close()
+
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        self.assertEqual([os.path.exists(p) for p in live + dead], [True, True, False, False])
+
+    def test_lzma_compression(self):
+        """Test compressed payloads in the packed log"""
+        self.manager.close()
+        self.manager = NotesManager(
+            self.test_notes_dir, self.test_backup_dir, storage="packed",
+            compression="lzma", compress_threshold=100
+        )
+        note = self.manager.create_note("Long", "Ide", "Compressible text. " * 200)
+        self.assertLess(self.manager.storage.stamp(note['id'])[1], 1000)
+        self.assertEqual(self.manager.storage.read_raw(note['id'])[:1], b"{")
+
+        self.manager.close()
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], note['content'])
+
+    def test_migrate_from_json(self):
+        """Test migrating existing JSON note files into the packed store"""
+        self.manager.close()
+        json_manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        note = json_manager.create_note("Old note", "Personal", "From JSON")
+
+        source = JsonNoteStorage(self.test_notes_dir)
+        target = PackedNoteStorage(self.test_notes_dir)
+        target.open()
+        self.assertEqual(migrate_notes(source, target), 1)
+        target.close()
+
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="packed")
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], "From JSON")
+        self.assertEqual(len(self.manager.get_notes_by_category("Personal")), 1)
+
+class TestSqliteNotesManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test environment with the SQLite storage backend"""
+        self.test_notes_dir = "test_notes"
+        self.test_backup_dir = "test_backup"
+        self.manager = NotesManager(
+            self.test_notes_dir, self.test_backup_dir, storage="sqlite"
+        )
+
+    def tearDown(self):
+        """Clean up test environment"""
+        self.manager.close()
+        if os.path.exists(self.test_notes_dir):
+            shutil.rmtree(self.test_notes_dir)
+        if os.path.exists(self.test_backup_dir):
+            shutil.rmtree(self.test_backup_dir)
+
+    def test_crud_in_database(self):
+        """Test that notes live in the database and support CRUD"""
+        note = self.manager.create_note("Stored", "Ide", "Kept in SQLite")
+        self.manager.update_note(note['id'], title="Stored v2")
+
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['title'], "Stored v2")
+        self.assertIsNone(self.manager.search_index)
+        self.assertFalse(os.path.exists(os.path.join(self.manager.index_dir, "search.log")))
+        # Queries and counts come from SQL, so no manifest is kept either
+        self.assertIsNone(self.manager.index)
+        self.assertFalse(os.path.exists(os.path.join(self.manager.index_dir, "manifest.log")))
+
+        self.assertTrue(self.manager.delete_note(note['id']))
+        self.assertIsNone(self.manager.get_note_by_id(note['id']))
+        self.assertFalse(self.manager.delete_note(note['id']))
+
+        self.manager.close()
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="sqlite")
+        self.assertEqual(self.manager.get_all_notes(), [])
+
+    def test_full_text_search(self):
+        """Test FTS5 search with prefix matching, AND semantics and ranking"""
+        in_content = self.manager.create_note(
+            "Weekly Report", "Pekerjaan", "Prepare the meeting agenda"
+        )
+        in_title = self.manager.create_note(
+            "Meeting Minutes", "Pekerjaan", "Summary of decisions"
+        )
+        self.manager.create_note("Shopping", "Personal", "Buy milk")
+
+        results = self.manager.search_notes("meet")
+        self.assertEqual(
+            [n['id'] for n in results],
+            [in_title['id'], in_content['id']]
+        )
+        results = self.manager.search_notes("meeting agenda")
+        self.assertEqual([n['id'] for n in results], [in_content['id']])
+
+        self.manager.update_note(in_content['id'], content="Nothing planned")
+        self.assertEqual(self.manager.search_notes("agenda"), [])
+
+    def test_date_and_category_queries(self):
+        """Test date range and category filters answered by the database"""
+        work = self.manager.create_note("Work", "Pekerjaan", "Content")
+        personal = self.manager.create_note("Personal", "Personal", "Content")
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        self.assertEqual(
+            [n['id'] for n in self.manager.get_notes_by_date(today)],
+            [personal['id'], work['id']]
+        )
+        self.assertEqual(
+            [n['id'] for n in self.manager.get_notes_by_category("Pekerjaan")],
+            [work['id']]
+        )
+        self.assertEqual(self.manager.count_notes(today, today, "Personal"), 1)
+        self.assertEqual(
+            [n['id'] for n in self.manager.iter_notes(order="oldest", limit=1)],
+            [work['id']]
+        )
+
+    def test_backup_restore(self):
+        """Test backup and restore with the SQLite backend"""
+        self.manager.create_note("Note 1", "Personal", "Content 1")
+        backup_file = self.manager.create_backup()
+        self.manager.create_note("Note 2", "Pekerjaan", "Content 2")
+
+        self.assertTrue(self.manager.restore_backup(backup_file))
+        notes = self.manager.get_all_notes()
+        self.assertEqual([n['title'] for n in notes], ["Note 1"])
+        self.assertEqual(len(self.manager.search_notes("content")), 1)
+
+        snapshot = self.manager.create_backup(incremental=True)
+        self.manager.delete_note(notes[0]['id'])
+        self.assertTrue(self.manager.restore_backup(snapshot))
+        self.assertEqual(self.manager.count_notes(), 1)
+
+        # Without the counter file the next ID is derived from the database
+        os.remove(self.manager.sequence_file)
+        note = self.manager.create_note("Note 3", "Ide", "Content 3")
+        self.assertTrue(note['id'].endswith("_002"))
+
+    def test_failed_restore_keeps_notes(self):
+        """Test that a broken backup rolls back without losing notes"""
+        note = self.manager.create_note("Keep Me", "Personal", "Content")
+        broken = os.path.join(self.test_backup_dir, "snapshot_broken.json")
+        with open(broken, 'w') as f:
+            json.dump({"notes": {"note_x": ["missing", 0, 0]}}, f)
+
+        with self.assertRaises(Exception):
+            self.manager.restore_backup(broken)
+        self.assertIsNotNone(self.manager.get_note_by_id(note['id']))
+        self.manager.create_note("After", "Ide", "Still writable")
+        self.assertEqual(self.manager.count_notes(), 2)
+
+    def test_compression_not_supported(self):
+        """Test that compression is rejected for the SQLite backend"""
+        with self.assertRaises(ValueError):
+            NotesManager(self.test_notes_dir, self.test_backup_dir,
+                         storage="sqlite", compression="zlib")
+
+    def test_import_from_json(self):
+        """Test importing existing JSON note files into the database"""
+        self.manager.close()
+        json_manager = NotesManager(self.test_notes_dir, self.test_backup_dir)
+        note = json_manager.create_note("Old note", "Personal", "From JSON")
+
+        source = JsonNoteStorage(self.test_notes_dir)
+        target = SqliteNoteStorage(self.test_notes_dir)
+        target.open()
+        self.assertEqual(migrate_notes(source, target), 1)
+        target.close()
+
+        self.manager = NotesManager(self.test_notes_dir, self.test_backup_dir, storage="sqlite")
+        self.assertEqual(self.manager.get_note_by_id(note['id'])['content'], "From JSON")
+        self.assertEqual(len(self.manager.search_notes("json")), 1)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import argparse
+import gc
+import itertools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from task_record import TaskRecord, CATEGORIES, PRIORITIES, STATUSES
+from todo_manager import TodoManager
+
+def generate_tasks(count, seed=42, start=date(2025, 1, 1), days=365):
+    """Menghasilkan dict tugas sintetis seperti hasil json.load tasks.json"""
+    rng = random.Random(seed)
+    for number in range(1, count + 1):
+        status = rng.choice(STATUSES)
+        created = start + timedelta(days=rng.randrange(days))
+        yield {
+            "id": f"task_{number:03d}",
+            "title": f"Tugas {number}",
+            "description": "",
+            "category": rng.choice(CATEGORIES),
+            "priority": rng.choice(PRIORITIES),
+            "status": status,
+            "due_date": (created + timedelta(days=rng.randrange(60))).isoformat(),
+            "created_at": created.isoformat(),
+            "completed_at": created.isoformat() if status == "Completed" else None,
+            "progress": 100 if status == "Completed" else 0
+        }
+
+def measure(name, build):
+    """Mengukur memori yang masih terpakai dan waktu membangun daftar tugas"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = build()
+    seconds = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"name": name, "tasks": len(tasks), "bytes": current, "seconds": seconds}
+
+def bench_bulk_add(count, seed=42, chunks=10):
+    """Mengukur waktu add_task per chunk dengan prioritas dan due date bervariasi
+
+    Biaya per tugas harus tetap datar; chunk terakhir yang jauh lebih lambat
+    dari chunk pertama berarti ada langkah yang memindai semua tugas.
+    """
+    tasks = generate_tasks(count, seed)
+    chunk_times = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = TodoManager(os.path.join(temp_dir, "tasks.json"))
+        for _ in range(chunks):
+            start = time.perf_counter()
+            for data in itertools.islice(tasks, count // chunks):
+                manager.add_task(data['title'], data['description'], data['category'],
+                                 data['priority'], data['due_date'])
+            chunk_times.append(time.perf_counter() - start)
+        manager.close()
+    return chunk_times
+
+def main():
+    """Membandingkan memori tugas berbentuk dict dengan TaskRecord"""
+    parser = argparse.ArgumentParser(description="Benchmark memori tugas")
+    parser.add_argument("--tasks", type=int, default=1_000_000, help="jumlah tugas sintetis")
+    parser.add_argument("--seed", type=int, default=42, help="seed data sintetis")
+    parser.add_argument("--bulk-add", action="store_true",
+                        help="ukur waktu add_task per chunk alih-alih memori")
+    args = parser.parse_args()
+
+    if args.bulk_add:
+        chunk_times = bench_bulk_add(args.tasks, args.seed)
+        for number, seconds in enumerate(chunk_times, 1):
+            print(f"chunk {number:2d} {seconds:8.3f}s")
+        print(f"rasio chunk terakhir/pertama: {chunk_times[-1] / chunk_times[0]:.2f}")
+        return
+
+    results = [
+        measure("dict", lambda: list(generate_tasks(args.tasks, args.seed))),
+        measure("TaskRecord", lambda: [
+            TaskRecord.from_dict(data) for data in generate_tasks(args.tasks, args.seed)
+        ]),
+    ]
+
+    print(f"\n{'format':12s} {'tugas':>9s} {'MB':>9s} {'byte/tugas':>11s} {'detik':>8s}")
+    for result in results:
+        print(f"{result['name']:12s} {result['tasks']:9d} {result['bytes'] / 2**20:9.1f} "
+              f"{result['bytes'] / result['tasks']:11.0f} {result['seconds']:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import functools
+import sys
+from datetime import date, datetime
+
+CATEGORIES = ("Pekerjaan", "Pribadi", "Belanja", "Belajar", "Lainnya")
+PRIORITIES = ("Tinggi", "Sedang", "Rendah")
+STATUSES = ("Pending", "In Progress", "Completed", "Cancelled")
+
+# Nilai -> kode kecil; int kecil di-cache Python sehingga tidak memakan objek baru
+CATEGORY_CODES = {value: code for code, value in enumerate(CATEGORIES)}
+PRIORITY_CODES = {value: code for code, value in enumerate(PRIORITIES)}
+STATUS_CODES = {value: code for code, value in enumerate(STATUSES)}
+
+@functools.lru_cache(maxsize=1024)
+def parse_date(date_str):
+    """Mengubah tanggal YYYY-MM-DD menjadi ordinal
+
+    Tugas cenderung memakai sedikit tanggal yang sama berulang kali, jadi
+    hasilnya di-cache; objek int ordinal yang sama juga dipakai bersama
+    oleh semua tugas dengan tanggal tersebut.
+    """
+    # date.fromisoformat juga menerima bentuk lain seperti 20251231
+    if len(date_str) != 10 or date_str[4] != '-' or date_str[7] != '-':
+        raise ValueError("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
+    try:
+        return date.fromisoformat(date_str).toordinal()
+    except ValueError:
+        raise ValueError("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
+
+@functools.lru_cache(maxsize=1024)
+def format_date(ordinal):
+    """Mengubah ordinal tanggal kembali menjadi string YYYY-MM-DD"""
+    return date.fromordinal(ordinal).isoformat()
+
+def normalize_date(date_str):
+    """Menyeragamkan tanggal tersimpan menjadi YYYY-MM-DD
+
+    Versi lama memvalidasi dengan ``strptime('%Y-%m-%d')`` yang juga
+    menerima bentuk tanpa nol seperti ``2025-1-5``. Hanya dipakai saat
+    memuat data tersimpan; input baru tetap divalidasi ketat oleh parse_date.
+    """
+    try:
+        parse_date(date_str)
+        return date_str
+    except ValueError:
+        return datetime.strptime(date_str, '%Y-%m-%d').date().isoformat()
+
+def _intern(value):
+    """Menyimpan satu salinan string yang sering berulang (misal tanggal dibuat)"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class TaskRecord:
+    """Tugas ringkas dengan __slots__, dipakai TodoManager di memori
+
+    Status, prioritas, dan kategori disimpan sebagai kode enum, due date
+    sebagai ordinal tanggal. Baca ``task['field']`` tetap sama seperti dict
+    lama; konversi ke dict hanya terjadi di batas JSON (``to_dict``).
+    Perubahan harus lewat method TodoManager agar indeksnya ikut diperbarui.
+    """
+
+    # Urutan field sama dengan urutan key di tasks.json
+    FIELDS = ("id", "title", "description", "category", "priority", "status",
+              "due_date", "created_at", "completed_at", "progress")
+
+    __slots__ = ("id", "title", "description", "category_code", "priority_code",
+                 "status_code", "due_ordinal", "created_at", "completed_at", "progress")
+
+    def __init__(self, id, title, description, category, priority, status,
+                 due_date, created_at, completed_at=None, progress=0):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.category_code = CATEGORY_CODES[category]
+        self.priority_code = PRIORITY_CODES[priority]
+        self.status_code = STATUS_CODES[status]
+        self.due_ordinal = parse_date(due_date)
+        self.created_at = _intern(created_at)
+        self.completed_at = _intern(completed_at)
+        self.progress = progress
+
+    @classmethod
+    def from_dict(cls, data):
+        """Membuat TaskRecord dari dict hasil json.load (tanggal lama dinormalkan)"""
+        try:
+            return cls(
+                data['id'], data['title'], data.get('description', ""),
+                data['category'], data['priority'], data['status'],
+                normalize_date(data['due_date']),
+                data.get('created_at'), data.get('completed_at'), data.get('progress', 0)
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Data tugas tidak valid: {e}")
+
+    def to_dict(self):
+        """Mengubah tugas menjadi dict untuk disimpan sebagai JSON"""
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def copy(self):
+        """Salinan dangkal tugas"""
+        clone = TaskRecord.__new__(TaskRecord)
+        for slot in self.__slots__:
+            setattr(clone, slot, getattr(self, slot))
+        return clone
+
+    @property
+    def category(self):
+        return CATEGORIES[self.category_code]
+
+    @category.setter
+    def category(self, value):
+        self.category_code = CATEGORY_CODES[value]
+
+    @property
+    def priority(self):
+        return PRIORITIES[self.priority_code]
+
+    @priority.setter
+    def priority(self, value):
+        self.priority_code = PRIORITY_CODES[value]
+
+    @property
+    def status(self):
+        return STATUSES[self.status_code]
+
+    @status.setter
+    def status(self, value):
+        self.status_code = STATUS_CODES[value]
+
+    @property
+    def due_date(self):
+        return format_date(self.due_ordinal)
+
+    @due_date.setter
+    def due_date(self, value):
+        self.due_ordinal = parse_date(value)
+
+    def __getitem__(self, field):
+        if field not in self.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field, value):
+        # Menulis langsung melewati indeks TodoManager dan membuatnya tidak sinkron
+        raise TypeError(
+            "Tugas tidak bisa diubah langsung, gunakan method TodoManager (update_task_*)"
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        if not isinstance(other, TaskRecord):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    # Diubah di tempat oleh TodoManager, jadi tidak hashable
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TaskRecord({self.to_dict()!r})"
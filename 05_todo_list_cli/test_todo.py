@@ -1,8 +1,10 @@
 import unittest
 import os
+import glob
 import json
 from datetime import date, timedelta
-from todo_manager import TodoManager
+from todo_manager import TodoManager, validate_date
+from task_record import TaskRecord
 
 class TestTodoManager(unittest.TestCase):
     def setUp(self):
@@ -12,8 +14,8 @@ class TestTodoManager(unittest.TestCase):
 
     def tearDown(self):
         """Clean up test environment"""
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        for path in glob.glob(self.test_file + "*"):
+            os.remove(path)
 
     def test_add_task(self):
         """Test adding a new task"""
@@ -207,5 +209,480 @@ class TestTodoManager(unittest.TestCase):
         self.assertEqual(updated_task['priority'], "Sedang")
         self.assertEqual(updated_task['due_date'], "2025-12-25")
 
+    def test_journal_replay_and_checkpoint(self):
+        """Test that mutations are journaled and checkpointed into the snapshot"""
+        manager = TodoManager(self.test_file, checkpoint_interval=5)
+        task = manager.add_task("Journaled", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        manager.update_task_status(task['id'], "In Progress")
+        other = manager.add_task("Removed", "Desc", "Pribadi", "Rendah", "2025-12-31")
+        manager.delete_task(other['id'])
+
+        self.assertFalse(os.path.exists(self.test_file))
+        with open(manager.journal_path) as f:
+            self.assertEqual(len(f.readlines()), 4)
+
+        reloaded = TodoManager(self.test_file)
+        self.assertEqual(reloaded.tasks, manager.tasks)
+        self.assertEqual(reloaded.tasks[0]['status'], "In Progress")
+
+        # The sixth record exceeds the interval and triggers a checkpoint
+        for progress in (10, 20):
+            manager.update_task_progress(task['id'], progress)
+        self.assertEqual(manager.journal_records, 0)
+        with open(manager.journal_path) as f:
+            self.assertEqual([json.loads(line)['op'] for line in f], ["meta"])
+        with open(self.test_file) as f:
+            self.assertEqual(json.load(f)[0]['progress'], 20)
+
+        # A half-written record at the end is ignored and cleaned up
+        manager.update_task_progress(task['id'], 40)
+        with open(manager.journal_path, 'a') as f:
+            f.write('{"op":"put","task":{"id"')
+        reloaded = TodoManager(self.test_file)
+        self.assertEqual(reloaded.tasks[0]['progress'], 40)
+        reloaded.update_task_progress(task['id'], 50)
+        self.assertEqual(TodoManager(self.test_file).tasks[0]['progress'], 50)
+
+    def test_task_lookup_index(self):
+        """Test that the id index stays consistent across mutations"""
+        ids = [
+            self.manager.add_task(f"Task {i}", "Desc", "Pekerjaan", "Sedang", "2025-12-31")['id']
+            for i in range(5)
+        ]
+        self.assertEqual(self.manager.get_task_by_id(ids[3])['title'], "Task 3")
+
+        self.manager.delete_task(ids[1])
+        self.assertIsNone(self.manager.get_task_by_id(ids[1]))
+        with self.assertRaises(ValueError):
+            self.manager.delete_task(ids[1])
+
+        self.manager.update_task_status(ids[0], "Completed")
+        self.manager.update_task_status(ids[4], "Completed")
+        self.assertEqual(self.manager.delete_completed_tasks(), 2)
+        self.assertIsNone(self.manager.get_task_by_id(ids[4]))
+        self.assertEqual([t['id'] for t in self.manager.tasks], [ids[2], ids[3]])
+        self.assertEqual([t['id'] for t in TodoManager(self.test_file).tasks], [ids[2], ids[3]])
+
+    def test_task_id_high_water_mark(self):
+        """Test that ids are never reused, even after deletes and checkpoints"""
+        first = self.manager.add_task("A", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        second = self.manager.add_task("B", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        self.manager.delete_task(second['id'])
+        self.manager.save_tasks()
+
+        manager = TodoManager(self.test_file)
+        third = manager.add_task("C", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        self.assertEqual(third['id'], "task_003")
+
+        # Without a journal the counter is recovered from the snapshot
+        manager.save_tasks()
+        os.remove(manager.journal_path)
+        self.assertEqual(TodoManager(self.test_file).generate_task_id(), "task_004")
+        self.assertEqual(first['id'], "task_001")
+
+    def test_combined_filters(self):
+        """Test bucket-indexed filters stay correct as fields change"""
+        a = self.manager.add_task("A", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        b = self.manager.add_task("B", "Desc", "Pekerjaan", "Rendah", "2025-12-31")
+        c = self.manager.add_task("C", "Desc", "Pribadi", "Tinggi", "2025-12-31")
+
+        pending_work = self.manager.filter_tasks(status="Pending", category="Pekerjaan")
+        self.assertEqual([t['id'] for t in pending_work], [a['id'], b['id']])
+
+        self.manager.update_task_progress(a['id'], 40)
+        self.manager.update_task_details(c['id'], category="Pekerjaan")
+        self.manager.update_task_status(a['id'], "Pending")
+        self.assertEqual(
+            [t['id'] for t in self.manager.filter_tasks(status="Pending", category="Pekerjaan")],
+            [a['id'], b['id'], c['id']]
+        )
+        self.assertEqual(
+            [t['id'] for t in self.manager.filter_tasks(priority="Tinggi", category="Pekerjaan")],
+            [a['id'], c['id']]
+        )
+        self.assertEqual(self.manager.get_tasks_by_category("Pribadi"), [])
+        self.assertEqual(len(self.manager.filter_tasks()), 3)
+
+        self.manager.delete_task(b['id'])
+        self.assertEqual(
+            [t['id'] for t in self.manager.get_tasks_by_priority("Rendah")], []
+        )
+        with self.assertRaises(ValueError):
+            self.manager.filter_tasks(status="Done")
+
+    def test_due_date_index(self):
+        """Test overdue, upcoming, range and calendar queries follow due date changes"""
+        today = date.today()
+        def day(offset):
+            return (today + timedelta(days=offset)).isoformat()
+
+        late = self.manager.add_task("Late", "Desc", "Pekerjaan", "Tinggi", day(-3))
+        soon = self.manager.add_task("Soon", "Desc", "Pekerjaan", "Tinggi", day(2))
+        later = self.manager.add_task("Later", "Desc", "Pribadi", "Rendah", day(10))
+        first = self.manager.add_task("First", "Desc", "Pribadi", "Rendah", day(1))
+
+        self.assertEqual([t['id'] for t in self.manager.get_overdue_tasks()], [late['id']])
+        self.assertEqual(
+            [t['id'] for t in self.manager.get_upcoming_tasks(2)], [first['id'], soon['id']]
+        )
+
+        self.manager.update_task_status(first['id'], "Completed")
+        self.manager.update_task_details(late['id'], due_date=day(5))
+        self.assertEqual(self.manager.get_overdue_tasks(), [])
+        self.assertEqual(
+            [t['id'] for t in self.manager.get_upcoming_tasks(3)],
+            [soon['id'], late['id'], later['id']]
+        )
+        # Date ranges still include completed tasks
+        self.assertEqual(
+            [t['id'] for t in self.manager.get_tasks_due_between(day(1), day(5))],
+            [first['id'], soon['id'], late['id']]
+        )
+
+        self.manager.delete_task(soon['id'])
+        target = today + timedelta(days=10)
+        calendar = self.manager.get_calendar(target.year, target.month)
+        self.assertEqual([t['id'] for t in calendar[target.day]], [later['id']])
+        with self.assertRaises(ValueError):
+            self.manager.get_tasks_due_between(day(5), day(1))
+
+    def test_date_validation(self):
+        """Test the shared date parser accepts only YYYY-MM-DD and orders by ordinal"""
+        for bad in ("2025-1-5", "20251231", "2025-02-30", "2025/12/31", None):
+            with self.assertRaises(ValueError):
+                validate_date(bad)
+        self.assertEqual(validate_date("2025-12-31"), date(2025, 12, 31).toordinal())
+
+        task = self.manager.add_task("Dated", "Desc", "Pribadi", "Rendah", "2025-02-28")
+        with self.assertRaises(ValueError):
+            self.manager.update_task_details(task['id'], due_date="2025-02-29")
+        self.manager.update_task_details(task['id'], due_date="2024-02-29")
+        self.assertEqual(task['due_date'], "2024-02-29")
+        self.assertEqual(list(self.manager.get_calendar(2024, 2)), [29])
+        self.assertEqual(self.manager.get_calendar(2024, 12), {})
+
+    def test_sorted_view(self):
+        """Test get_all_tasks keeps priority/due date order through updates"""
+        low = self.manager.add_task("Low", "Desc", "Pribadi", "Rendah", "2025-01-01")
+        high_late = self.manager.add_task("High late", "Desc", "Pribadi", "Tinggi", "2025-12-31")
+        high_early = self.manager.add_task("High early", "Desc", "Pribadi", "Tinggi", "2025-06-01")
+        medium = self.manager.add_task("Medium", "Desc", "Pribadi", "Sedang", "2025-03-01")
+
+        def ids():
+            return [t['id'] for t in self.manager.get_all_tasks()]
+
+        self.assertEqual(ids(), [high_early['id'], high_late['id'], medium['id'], low['id']])
+
+        self.manager.update_task_details(low['id'], priority="Tinggi")
+        self.manager.update_task_details(high_early['id'], due_date="2026-01-01")
+        self.manager.delete_task(medium['id'])
+        self.assertEqual(ids(), [low['id'], high_late['id'], high_early['id']])
+
+        reloaded = TodoManager(self.test_file)
+        self.assertEqual([t['id'] for t in reloaded.get_all_tasks()], ids())
+
+    def test_batch_commit_and_rollback(self):
+        """Test batch() writes once on success and restores memory on error"""
+        keep = self.manager.add_task("Keep", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        gone = self.manager.add_task("Gone", "Desc", "Pekerjaan", "Tinggi", "2025-11-30")
+        journal = self.manager.journal_path
+        size_before = os.path.getsize(journal)
+
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                self.manager.add_task("New", "Desc", "Pribadi", "Rendah", "2025-10-01")
+                self.manager.update_task_details(keep['id'], title="Changed", priority="Rendah")
+                self.manager.delete_task(gone['id'])
+                raise RuntimeError("boom")
+
+        self.assertEqual(os.path.getsize(journal), size_before)
+        self.assertEqual([t['title'] for t in self.manager.tasks], ["Keep", "Gone"])
+        self.assertEqual(self.manager.get_tasks_by_priority("Tinggi"), self.manager.tasks)
+        self.assertEqual([t['id'] for t in self.manager.get_all_tasks()], [gone['id'], keep['id']])
+        self.assertEqual(self.manager.generate_task_id(), "task_003")
+
+        added = self.manager.add_tasks([
+            {"title": f"Bulk {i}", "description": "", "category": "Belajar",
+             "priority": "Sedang", "due_date": "2025-12-01"}
+            for i in range(3)
+        ])
+        self.manager.update_status_many([t['id'] for t in added], "Completed")
+        with self.assertRaises(ValueError):
+            self.manager.add_tasks([
+                {"title": "Ok", "description": "", "category": "Belajar",
+                 "priority": "Sedang", "due_date": "2025-12-01"},
+                {"title": "Bad", "description": "", "category": "Belajar",
+                 "priority": "Sedang", "due_date": "not-a-date"}
+            ])
+
+        reloaded = TodoManager(self.test_file)
+        self.assertEqual(len(reloaded.tasks), 5)
+        self.assertEqual(len(reloaded.get_tasks_by_status("Completed")), 3)
+
+    def test_task_record(self):
+        """Test compact task records behave like dicts and round-trip through JSON"""
+        task = self.manager.add_task("Record", "Desc", "Belanja", "Sedang", "2025-07-04")
+        self.assertFalse(hasattr(task, '__dict__'))
+        self.assertEqual(task['category'], "Belanja")
+        self.assertEqual(task['due_date'], "2025-07-04")
+        with self.assertRaises(KeyError):
+            task['unknown']
+        # Item assignment would bypass the manager's indexes
+        with self.assertRaises(TypeError):
+            task['due_date'] = "2030-01-01"
+        self.assertEqual(self.manager.get_tasks_due_between("2025-07-04", "2025-07-04"), [task])
+
+        self.manager.update_task_progress(task['id'], 100)
+        self.manager.save_tasks()
+        with open(self.test_file, 'r', encoding='utf-8') as f:
+            saved = json.load(f)[0]
+        self.assertEqual(saved, task.to_dict())
+        self.assertEqual(saved['status'], "Completed")
+        self.assertEqual(list(saved), list(TaskRecord.FIELDS))
+        self.assertEqual(TodoManager(self.test_file).get_task_by_id(task['id']), task)
+
+        self.manager.tasks = [dict(saved, id="task_100")]
+        self.assertEqual(self.manager.get_task_by_id("task_100")['status'], "Completed")
+        with self.assertRaises(ValueError):
+            TaskRecord.from_dict({"id": "task_200"})
+
+    def test_load_legacy_dates(self):
+        """Test that files written by the old strptime validation still open"""
+        legacy = {
+            "id": "task_001", "title": "Lama", "description": "", "category": "Pribadi",
+            "priority": "Sedang", "status": "Pending", "due_date": "2025-1-5",
+            "created_at": "2024-12-01", "completed_at": None, "progress": 0
+        }
+        with open(self.test_file, 'w', encoding='utf-8') as f:
+            json.dump([legacy], f)
+
+        manager = TodoManager(self.test_file)
+        self.assertEqual(manager.get_task_by_id("task_001")['due_date'], "2025-01-05")
+        self.assertEqual(
+            [t['id'] for t in manager.get_tasks_due_between("2025-01-01", "2025-01-31")],
+            ["task_001"]
+        )
+        manager.close()
+
+        # New input keeps the strict format
+        with self.assertRaises(ValueError):
+            self.manager.add_task("Baru", "", "Pribadi", "Sedang", "2025-1-5")
+
+    def test_concurrent_managers(self):
+        """Test two managers sharing one file see each other's writes"""
+        first = self.manager
+        second = TodoManager(self.test_file)
+        a = first.add_task("From first", "Desc", "Pekerjaan", "Tinggi", "2025-12-31")
+        b = second.add_task("From second", "Desc", "Pribadi", "Rendah", "2025-12-30")
+        self.assertNotEqual(a['id'], b['id'])
+        self.assertEqual(len(second.tasks), 2)
+
+        # Reads do not reload; refresh or the next write picks up the change
+        self.assertEqual(len(first.tasks), 1)
+        first.refresh()
+        self.assertEqual([t['id'] for t in first.get_all_tasks()], [a['id'], b['id']])
+
+        second.update_task_status(a['id'], "Completed")
+        second.save_tasks()
+        first.update_task_details(b['id'], title="Renamed")
+        self.assertEqual(first.get_task_by_id(a['id'])['status'], "Completed")
+        self.assertEqual(first.get_tasks_by_status("Completed"), [first.get_task_by_id(a['id'])])
+
+        reloaded = TodoManager(self.test_file)
+        self.assertEqual(reloaded.get_task_by_id(b['id'])['title'], "Renamed")
+        self.assertEqual(reloaded.get_task_by_id(a['id'])['status'], "Completed")
+        second.close()
+
+    @unittest.skipIf(not hasattr(os, "fork"), "requires fork")
+    def test_concurrent_processes(self):
+        """Test writers in separate processes do not lose tasks or reuse ids"""
+        children = []
+        for worker in range(4):
+            pid = os.fork()
+            if pid == 0:
+                manager = TodoManager(self.test_file, checkpoint_interval=20)
+                for i in range(25):
+                    manager.add_task(f"W{worker} {i}", "", "Lainnya", "Sedang", "2025-12-31")
+                os._exit(0)
+            children.append(pid)
+        for pid in children:
+            self.assertEqual(os.waitpid(pid, 0)[1], 0)
+
+        tasks = TodoManager(self.test_file).tasks
+        self.assertEqual(len(tasks), 100)
+        self.assertEqual(len({t['id'] for t in tasks}), 100)
+
+    def test_import_export(self):
+        """Test streaming CSV/JSONL import reports bad rows and round-trips"""
+        csv_path = self.test_file + ".import.csv"
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("title,description,category,priority,due_date,status,progress,"
+                    "created_at,completed_at\n")
+            f.write("Satu,Desc,Pekerjaan,Tinggi,2025-12-31,,,,\n")
+            f.write("Dua,,Invalid,Tinggi,2025-12-31,,,,\n")
+            f.write("Tiga,,Pribadi,Rendah,31-12-2025,,,,\n")
+            f.write("Empat,,Belajar,Sedang,2025-11-30,Completed,,2025-11-01,2025-11-20\n")
+            f.write(",,Belajar,Sedang,2025-11-30,,,,\n")
+            f.write("Lima,,Pribadi,Rendah,2025-12-15,In Progress,40,2025-10-05,\n")
+            f.write("Enam,,Pribadi,Rendah,2025-12-15,In Progress,140,,\n")
+
+        report = self.manager.import_tasks(csv_path, chunk_size=2)
+        self.assertEqual(report['imported'], 3)
+        self.assertEqual([number for number, _ in report['errors']], [3, 4, 6, 8])
+        self.assertEqual(report['errors'][0][1], "Kategori tidak valid!")
+        self.assertEqual(report['errors'][3][1], "Progress harus antara 0-100!")
+        # Single append: one put per task
+        with open(self.manager.journal_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+        # Progress and dates from the file are kept as they are
+        completed, in_progress = self.manager.tasks[1], self.manager.tasks[2]
+        self.assertEqual(
+            (completed['status'], completed['progress'], completed['created_at'],
+             completed['completed_at']),
+            ("Completed", 100, "2025-11-01", "2025-11-20")
+        )
+        self.assertEqual(
+            (in_progress['status'], in_progress['progress'], in_progress['created_at'],
+             in_progress['completed_at']),
+            ("In Progress", 40, "2025-10-05", None)
+        )
+
+        # Everything except the id survives an export/import round trip
+        without_id = lambda tasks: [
+            {k: v for k, v in t.to_dict().items() if k != "id"} for t in tasks
+        ]
+        for extension in (".jsonl", ".csv"):
+            export_path = self.test_file + ".export" + extension
+            self.assertEqual(self.manager.export_tasks(export_path), 3)
+            other = TodoManager(self.test_file + ".other" + extension + ".json")
+            report = other.import_tasks(export_path)
+            self.assertEqual((report['imported'], report['errors']), (3, []))
+            self.assertEqual(without_id(other.tasks), without_id(self.manager.tasks))
+            other.close()
+
+        jsonl_path = self.test_file + ".export.jsonl"
+        with open(jsonl_path, 'a', encoding='utf-8') as f:
+            f.write("{not json\n")
+        other = TodoManager(self.test_file + ".broken.json")
+        report = other.import_tasks(jsonl_path)
+        self.assertEqual(report['imported'], 3)
+        self.assertEqual(report['errors'], [(4, "Baris bukan objek JSON yang valid!")])
+        other.close()
+
+        with self.assertRaises(ValueError):
+            self.manager.export_tasks(self.test_file + ".xml")
+
+    def test_import_spills_records_per_chunk(self):
+        """Test that pending journal records stay bounded by the chunk size"""
+        existing = self.manager.add_task("Lama", "", "Pribadi", "Sedang", "2025-12-31")
+        csv_path = self.test_file + ".import.csv"
+        with open(csv_path, 'w', encoding='utf-8') as f:
+            f.write("title,category,priority,due_date\n")
+            for i in range(50):
+                f.write(f"Tugas {i},Pekerjaan,Tinggi,2025-12-{i % 28 + 1:02d}\n")
+
+        pending = []
+        def record_pending(imported, rejected):
+            pending.append(len(self.manager._batch['records']))
+        report = self.manager.import_tasks(csv_path, chunk_size=10, progress=record_pending)
+        self.assertEqual(report['imported'], 50)
+        self.assertEqual(pending, [0] * 5)
+        with open(self.manager.journal_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 51)
+        self.assertEqual(len(TodoManager(self.test_file).tasks), 51)
+
+        # A failure after some chunks were spilled rolls everything back
+        def fail(imported, rejected):
+            if imported == 20:
+                raise RuntimeError("stop")
+        with self.assertRaises(RuntimeError):
+            self.manager.import_tasks(csv_path, chunk_size=10, progress=fail)
+        self.assertEqual(len(self.manager.tasks), 51)
+        self.assertEqual(self.manager.get_all_tasks()[-1], existing)
+        self.assertEqual(len(TodoManager(self.test_file).tasks), 51)
+
+    def test_import_rejects_non_text_fields(self):
+        """Test that non-string JSONL values become row errors instead of aborting"""
+        jsonl_path = self.test_file + ".import.jsonl"
+        rows = [
+            {"title": 5, "category": "Pekerjaan", "priority": "Tinggi", "due_date": "2025-12-31"},
+            {"title": "Valid", "category": "Pekerjaan", "priority": "Tinggi", "due_date": "2025-12-31"},
+            {"title": "Desc", "description": ["x"], "category": "Pribadi",
+             "priority": "Rendah", "due_date": "2025-12-31"},
+            {"title": "Kategori", "category": ["Pekerjaan"], "priority": "Tinggi",
+             "due_date": "2025-12-31"},
+        ]
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+        report = self.manager.import_tasks(jsonl_path)
+        self.assertEqual(report['imported'], 1)
+        self.assertEqual(report['errors'], [
+            (1, "Judul harus berupa teks!"),
+            (3, "Deskripsi harus berupa teks!"),
+            (4, "Kategori tidak valid!"),
+        ])
+        self.assertEqual([t['title'] for t in self.manager.tasks], ["Valid"])
+
+    def test_statistics(self):
+        """Test statistics follow every mutation, including batch rollback"""
+        self.assertEqual(self.manager.get_statistics()['total'], 0)
+        self.assertEqual(self.manager.get_statistics()['completion_rate'], 0.0)
+
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        a = self.manager.add_task("A", "Desc", "Pekerjaan", "Tinggi", yesterday)
+        b = self.manager.add_task("B", "Desc", "Pribadi", "Rendah", "2099-01-01")
+        c = self.manager.add_task("C", "Desc", "Pribadi", "Sedang", yesterday)
+        self.manager.update_task_progress(a['id'], 100)
+        self.manager.update_task_progress(b['id'], 50)
+
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['total'], 3)
+        self.assertEqual(stats['by_status']["Completed"], 1)
+        self.assertEqual(stats['by_status']["In Progress"], 1)
+        self.assertEqual(stats['by_category'], {
+            "Pekerjaan": 1, "Pribadi": 2, "Belanja": 0, "Belajar": 0, "Lainnya": 0
+        })
+        self.assertEqual(stats['completion_rate'], 33.3)
+        self.assertEqual(stats['average_progress'], 50.0)
+        self.assertEqual(stats['overdue'], 1)
+
+        with self.assertRaises(RuntimeError):
+            with self.manager.batch():
+                self.manager.update_task_progress(c['id'], 100)
+                raise RuntimeError("boom")
+        self.manager.delete_task(b['id'])
+        stats = self.manager.get_statistics()
+        self.assertEqual(stats['average_progress'], 50.0)
+        self.assertEqual(stats['by_priority'], {"Tinggi": 1, "Sedang": 1, "Rendah": 0})
+        self.assertEqual(stats['overdue'], 1)
+        self.assertEqual(TodoManager(self.test_file).get_statistics(), stats)
+
+    def test_bulk_add_keeps_indexes_sorted(self):
+        """Test bulk adds with varied keys without scanning existing tasks for ids"""
+        priorities = ["Tinggi", "Sedang", "Rendah"]
+        with self.manager.batch():
+            for i in range(3000):
+                due = date(2025, 1, 1) + timedelta(days=(i * 37) % 365)
+                self.manager.add_task(f"Bulk {i}", "", "Lainnya", priorities[i % 3],
+                                      due.isoformat())
+
+        # Every insert lands mid-list, yet both views stay in key order
+        tasks = self.manager.get_all_tasks()
+        self.assertEqual(
+            tasks,
+            sorted(self.manager.tasks,
+                   key=lambda t: (priorities.index(t['priority']), t['due_date']))
+        )
+        due_dates = [t['due_date'] for t in self.manager.get_tasks_due_between(
+            "2025-01-01", "2025-12-31")]
+        self.assertEqual(due_dates, sorted(due_dates))
+
+        # A new id comes from the counter alone, never from the stored tasks
+        tasks, self.manager._tasks = self.manager._tasks, None
+        self.assertEqual(self.manager.generate_task_id(), "task_3001")
+        self.manager._tasks = tasks
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
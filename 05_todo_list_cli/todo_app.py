@@ -18,9 +18,9 @@ def clear_screen():
     """Membersihkan layar terminal"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
-def print_colored(text, color):
+def print_colored(text, color, end="\n"):
     """Mencetak teks dengan warna"""
-    print(f"{COLORS[color]}{text}{COLORS['ENDC']}")
+    print(f"{COLORS[color]}{text}{COLORS['ENDC']}", end=end)
 
 def get_priority_color(priority):
     """Mendapatkan warna berdasarkan prioritas"""
@@ -56,6 +56,19 @@ def get_valid_date():
         except ValueError:
             print("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
 
+def choose_optional(label, options):
+    """Memilih satu opsi dari daftar, None jika dilewati"""
+    print(f"\n{label}:")
+    for i, option in enumerate(options, 1):
+        print(f"{i}. {option}")
+    try:
+        choice = int(input(f"Pilih {label.lower()} (0 untuk semua): "))
+        if 1 <= choice <= len(options):
+            return options[choice-1]
+    except ValueError:
+        pass
+    return None
+
 def add_task(manager):
     """Menu menambah tugas baru"""
     print_colored("\n=== Tambah Tugas Baru ===", 'HEADER')
@@ -105,6 +118,8 @@ def add_task(manager):
 def view_tasks(manager):
     """Menu melihat tugas"""
     while True:
+        # Ambil perubahan dari proses lain (misal cron) sebelum menampilkan
+        manager.refresh()
         print_colored("\n=== Lihat Tugas ===", 'HEADER')
         print("1. Semua tugas")
         print("2. Filter berdasarkan status")
@@ -112,9 +127,12 @@ def view_tasks(manager):
         print("4. Filter berdasarkan kategori")
         print("5. Tampilan kalender")
         print("6. Tugas yang lewat deadline")
-        print("7. Kembali ke menu utama")
+        print("7. Filter gabungan (status, prioritas, kategori)")
+        print("8. Deadline terdekat")
+        print("9. Tugas dalam rentang tanggal")
+        print("10. Kembali ke menu utama")
 
-        choice = input("\nPilihan Anda (1-7): ")
+        choice = input("\nPilihan Anda (1-10): ")
 
         if choice == '1':
             tasks = manager.get_all_tasks()
@@ -181,20 +199,22 @@ def view_tasks(manager):
             
             print_colored(f"\n{calendar.month_name[today.month]} {today.year}", 'HEADER')
             print("Mo Tu We Th Fr Sa Su")
+            due_days = manager.get_calendar(today.year, today.month)
             
             for week in cal:
                 for day in week:
                     if day == 0:
                         print("  ", end=" ")
+                    elif day in due_days:
+                        print_colored(f"{day:2d}", 'RED', end=" ")
                     else:
-                        date_str = f"{today.year}-{today.month:02d}-{day:02d}"
-                        tasks_today = [t for t in manager.tasks if t['due_date'] == date_str]
-                        if tasks_today:
-                            print_colored(f"{day:2d}", 'RED', end=" ")
-                        else:
-                            print(f"{day:2d}", end=" ")
+                        print(f"{day:2d}", end=" ")
                 print()
 
+            for day in sorted(due_days):
+                titles = ", ".join(task['title'] for task in due_days[day])
+                print(f"{day:2d}: {titles}")
+
             input("\nTekan Enter untuk melanjutkan...")
 
         elif choice == '6':
@@ -207,6 +227,40 @@ def view_tasks(manager):
                 print_task(task)
 
         elif choice == '7':
+            status = choose_optional("Status", manager.statuses)
+            priority = choose_optional("Prioritas", manager.priorities)
+            category = choose_optional("Kategori", manager.categories)
+            tasks = manager.filter_tasks(status=status, priority=priority, category=category)
+            if not tasks:
+                print_colored("\nTidak ada tugas yang cocok!", 'YELLOW')
+                continue
+            for task in tasks:
+                print_task(task)
+
+        elif choice == '8':
+            tasks = manager.get_upcoming_tasks()
+            if not tasks:
+                print_colored("\nTidak ada deadline yang akan datang!", 'GREEN')
+                continue
+            print_colored("\nDeadline terdekat:", 'YELLOW')
+            for task in tasks:
+                print_task(task)
+
+        elif choice == '9':
+            start_date = input("\nTanggal awal (YYYY-MM-DD): ")
+            end_date = input("Tanggal akhir (YYYY-MM-DD): ")
+            try:
+                tasks = manager.get_tasks_due_between(start_date, end_date)
+            except ValueError as e:
+                print_colored(f"Error: {str(e)}", 'RED')
+                continue
+            if not tasks:
+                print_colored("\nTidak ada tugas dalam rentang tersebut!", 'YELLOW')
+                continue
+            for task in tasks:
+                print_task(task)
+
+        elif choice == '10':
             break
 
 def update_task(manager):
@@ -355,6 +409,23 @@ def delete_task(manager):
             else:
                 print_colored("Tidak ada tugas selesai untuk dihapus!", 'YELLOW')
 
+def show_statistics(manager):
+    """Menampilkan ringkasan statistik tugas"""
+    manager.refresh()
+    stats = manager.get_statistics()
+    print_colored("\n=== Statistik Tugas ===", 'HEADER')
+    print(f"Total tugas        : {stats['total']}")
+    print(f"Tingkat selesai    : {stats['completion_rate']}%")
+    print(f"Rata-rata progress : {stats['average_progress']}%")
+    color = 'RED' if stats['overdue'] else 'GREEN'
+    print_colored(f"Lewat deadline     : {stats['overdue']}", color)
+
+    for title, key in (("Status", 'by_status'), ("Prioritas", 'by_priority'),
+                       ("Kategori", 'by_category')):
+        print_colored(f"\n{title}:", 'BOLD')
+        for value, count in stats[key].items():
+            print(f"  {value:12s} {count}")
+
 def main():
     """Fungsi utama program"""
     manager = TodoManager()
@@ -366,9 +437,10 @@ def main():
         print("2. Lihat Tugas")
         print("3. Update Tugas")
         print("4. Hapus Tugas")
-        print("5. Keluar")
+        print("5. Statistik")
+        print("6. Keluar")
 
-        choice = input("\nPilihan Anda (1-5): ")
+        choice = input("\nPilihan Anda (1-6): ")
 
         if choice == '1':
             add_task(manager)
@@ -379,7 +451,10 @@ def main():
         elif choice == '4':
             delete_task(manager)
         elif choice == '5':
+            show_statistics(manager)
+        elif choice == '6':
             print_colored("\nTerima kasih telah menggunakan Todo List CLI!", 'BLUE')
+            manager.close()
             break
         else:
             print_colored("Pilihan tidak valid!", 'RED')
@@ -1,100 +1,673 @@
+import bisect
+import csv
+import functools
+import itertools
 import json
 import os
-from datetime import datetime, date
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+from task_record import TaskRecord, CATEGORIES, PRIORITIES, STATUSES, parse_date
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: tanpa lock antar proses, deteksi perubahan tetap berjalan
+    fcntl = None
+
+def task_number(task_id):
+    """Nomor urut dari ID berformat task_NNN, None jika formatnya lain"""
+    prefix, _, number = task_id.partition('_')
+    if prefix == "task" and number.isdigit():
+        return int(number)
+    return None
+
+def validate_date(date_str):
+    """Memastikan tanggal berformat YYYY-MM-DD, mengembalikan ordinalnya"""
+    try:
+        return parse_date(date_str)
+    except TypeError:
+        # Bukan string (misal None dari baris impor yang kosong)
+        raise ValueError("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
+
+def file_stamp(path):
+    """(inode, mtime_ns, size) sebuah file, None jika file belum ada"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+# Ekstensi file yang didukung impor/ekspor
+TRANSFER_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+def transfer_format(path):
+    """Format file impor/ekspor berdasarkan ekstensinya"""
+    fmt = TRANSFER_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError("Format file tidak dikenal! Gunakan .csv atau .jsonl")
+    return fmt
+
+def iter_task_rows(path):
+    """Membaca file CSV/JSONL baris per baris sebagai (nomor baris, dict)
+
+    Baris JSONL yang bukan objek JSON valid dihasilkan dengan dict None.
+    """
+    if transfer_format(path) == "csv":
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+
+def exclusive(method):
+    """Menjalankan method TodoManager di bawah lock file antar proses"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._exclusive():
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class TodoManager:
-    def __init__(self, file_path="tasks.json"):
+    # Field yang punya indeks bucket nilai -> {id: tugas}
+    INDEXED_FIELDS = ("status", "priority", "category")
+    # Status yang tidak lagi dihitung untuk deadline
+    CLOSED_STATUSES = ("Completed", "Cancelled")
+
+    def __init__(self, file_path="tasks.json", checkpoint_interval=1000):
         """Inisialisasi TodoManager"""
         self.file_path = file_path
-        self.categories = ["Pekerjaan", "Pribadi", "Belanja", "Belajar", "Lainnya"]
-        self.priorities = ["Tinggi", "Sedang", "Rendah"]
-        self.statuses = ["Pending", "In Progress", "Completed", "Cancelled"]
-        self.tasks = self.load_tasks()
+        # Setiap perubahan ditambahkan ke journal, snapshot ditulis ulang
+        # hanya saat checkpoint
+        self.journal_path = file_path + ".journal"
+        self.checkpoint_interval = checkpoint_interval
+        self.journal_records = 0
+        # Record journal dan salinan tugas asli selama batch() aktif
+        self._batch = None
+        # Nomor ID terbesar yang pernah dipakai, tidak turun walau tugas dihapus
+        self.last_id = 0
+        self.categories = list(CATEGORIES)
+        self.priorities = list(PRIORITIES)
+        self.statuses = list(STATUSES)
+        self._priority_rank = {priority: rank for rank, priority in enumerate(self.priorities)}
+        # Lock advisory (fcntl) dipegang selama menulis, bisa diambil bersarang
+        self.lock_path = file_path + ".lock"
+        self._lock_file = None
+        self._lock_depth = 0
+        # Keadaan file yang terakhir dimuat, untuk mendeteksi tulisan proses lain
+        self._snapshot_stamp = None
+        self._journal_inode = None
+        self._journal_offset = 0
+        self.tasks = []
+        self.refresh()
+
+    @property
+    def tasks(self):
+        """Daftar semua tugas sesuai urutan penambahan"""
+        return list(self._tasks.values())
+
+    @tasks.setter
+    def tasks(self, tasks):
+        # Indeks ID ke tugas; dict menjaga urutan penambahan
+        self._tasks = {}
+        # Nomor urut penambahan, untuk mengembalikan hasil filter sesuai urutan
+        self._order = {}
+        self._sequence = 0
+        self._buckets = {field: {} for field in self.INDEXED_FIELDS}
+        # Daftar (ordinal due date, urutan, id) terurut: semua tugas dan tugas yang masih terbuka
+        self._by_due = []
+        self._open_by_due = []
+        # Tampilan semua tugas terurut (prioritas, ordinal due date, urutan, id)
+        self._sorted = []
+        # Jumlah progress semua tugas, untuk rata-rata di get_statistics
+        self._progress_total = 0
+        for task in tasks:
+            if not isinstance(task, TaskRecord):
+                task = TaskRecord.from_dict(task)
+            self._tasks[task.id] = task
+            self._sequence += 1
+            self._order[task.id] = self._sequence
+            for field in self.INDEXED_FIELDS:
+                self._buckets[field].setdefault(getattr(task, field), {})[task.id] = task
+            self._progress_total += task.progress
+        # Indeks terurut dibangun sekali dengan sort, bukan insort per tugas
+        self._by_due = sorted(self._due_key(task) for task in self._tasks.values())
+        self._open_by_due = [
+            key for key in self._by_due
+            if self._tasks[key[2]].status not in self.CLOSED_STATUSES
+        ]
+        self._sorted = sorted(self._sort_key(task) for task in self._tasks.values())
+
+    def _due_key(self, task):
+        """Kunci tugas di indeks due date"""
+        return (task.due_ordinal, self._order[task.id], task.id)
+
+    def _sort_key(self, task):
+        """Kunci tugas di tampilan terurut get_all_tasks"""
+        return (self._priority_rank[task.priority],) + self._due_key(task)
+
+    def _index_task(self, task):
+        """Memasukkan tugas ke indeks bucket, indeks due date, dan tampilan terurut"""
+        for field in self.INDEXED_FIELDS:
+            self._buckets[field].setdefault(getattr(task, field), {})[task.id] = task
+        key = self._due_key(task)
+        bisect.insort(self._by_due, key)
+        if task.status not in self.CLOSED_STATUSES:
+            bisect.insort(self._open_by_due, key)
+        bisect.insort(self._sorted, self._sort_key(task))
+        self._progress_total += task.progress
+
+    def _unindex_task(self, task):
+        """Mengeluarkan tugas dari semua indeks (dipanggil sebelum field berubah)"""
+        self._remember(task.id)
+        for field in self.INDEXED_FIELDS:
+            bucket = self._buckets[field].get(getattr(task, field))
+            if bucket:
+                bucket.pop(task.id, None)
+        self._progress_total -= task.progress
+        due_key = self._due_key(task)
+        for keys, key in ((self._by_due, due_key), (self._open_by_due, due_key),
+                          (self._sorted, self._sort_key(task))):
+            position = bisect.bisect_left(keys, key)
+            if position < len(keys) and keys[position] == key:
+                del keys[position]
+
+    def _insert(self, task):
+        """Menambahkan tugas ke penyimpanan di memori beserta indeksnya"""
+        self._remember(task.id)
+        self._tasks[task.id] = task
+        self._sequence += 1
+        self._order[task.id] = self._sequence
+        self._index_task(task)
+
+    def _discard(self, task_id):
+        """Menghapus tugas dari penyimpanan di memori beserta indeksnya"""
+        task = self._tasks[task_id]
+        self._unindex_task(task)
+        del self._tasks[task_id]
+        del self._order[task_id]
+        return task
+
+    @contextmanager
+    def _exclusive(self):
+        """Mengambil lock file; saat pertama diambil, tulisan proses lain dimuat dulu"""
+        if self._lock_depth:
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+            return
+
+        if fcntl is not None:
+            if self._lock_file is None:
+                self._lock_file = open(self.lock_path, 'a')
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self._lock_depth = 1
+        try:
+            self._sync()
+            yield
+        finally:
+            self._lock_depth = 0
+            if fcntl is not None:
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Memuat perubahan yang ditulis proses lain sejak terakhir dibaca"""
+        with self._exclusive():
+            pass
+
+    def close(self):
+        """Melepas file lock"""
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _sync(self):
+        """Membandingkan stamp file dengan yang terakhir dimuat (dipanggil di bawah lock)
+
+        Record baru di ujung journal cukup diputar ulang. Jika snapshot
+        berubah atau journal diganti (checkpoint proses lain), semua tugas
+        dimuat ulang.
+        """
+        journal = file_stamp(self.journal_path)
+        journal_inode, journal_size = (journal[0], journal[2]) if journal else (None, 0)
+        if (file_stamp(self.file_path) != self._snapshot_stamp
+                or journal_inode != self._journal_inode
+                or journal_size < self._journal_offset):
+            self.tasks = self.load_tasks()
+        elif journal_size > self._journal_offset:
+            self._replay_journal()
+
+    def _read_journal(self, offset=0):
+        """Membaca record journal mulai offset byte tertentu
+
+        Mengembalikan (records, offset setelah record utuh terakhir, rusak).
+        """
+        records = []
+        corrupt = False
+        with open(self.journal_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("baris belum lengkap")
+                    records.append(json.loads(line))
+                except ValueError:
+                    # Baris terakhir terpotong (misal crash saat menulis)
+                    corrupt = True
+                    break
+                offset += len(line)
+        return records, offset, corrupt
 
     def load_tasks(self):
-        """Memuat tugas dari file JSON"""
-        if os.path.exists(self.file_path):
+        """Memuat tugas dari snapshot JSON lalu memutar ulang journal"""
+        tasks = []
+        self._snapshot_stamp = file_stamp(self.file_path)
+        if self._snapshot_stamp:
             try:
                 with open(self.file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    tasks = [TaskRecord.from_dict(data) for data in json.load(f)]
             except json.JSONDecodeError:
-                return []
-        return []
+                tasks = []
+
+        self.journal_records = 0
+        # Dipulihkan dari data sekali saat load, selanjutnya cukup dinaikkan
+        self.last_id = max(
+            (number for number in map(task_number, (t.id for t in tasks)) if number),
+            default=0
+        )
+        journal = file_stamp(self.journal_path)
+        self._journal_inode = journal and journal[0]
+        self._journal_offset = 0
+        if not journal:
+            return tasks
+
+        by_id = {task.id: task for task in tasks}
+        records, self._journal_offset, corrupt = self._read_journal()
+        for record in records:
+            if record['op'] == 'meta':
+                self.last_id = max(self.last_id, record['last_id'])
+                continue
+            if record['op'] == 'put':
+                task = TaskRecord.from_dict(record['task'])
+                by_id[task.id] = task
+                self.last_id = max(self.last_id, task_number(task.id) or 0)
+            elif record['op'] == 'del':
+                by_id.pop(record['id'], None)
+            self.journal_records += 1
+
+        tasks = list(by_id.values())
+        if corrupt:
+            # Tulis ulang segera agar record baru tidak tersambung ke baris rusak
+            self.tasks = tasks
+            self.save_tasks()
+        return tasks
 
+    def _replay_journal(self):
+        """Memutar ulang record yang ditambahkan proses lain ke ujung journal"""
+        records, self._journal_offset, corrupt = self._read_journal(self._journal_offset)
+        for record in records:
+            if record['op'] == 'meta':
+                self.last_id = max(self.last_id, record['last_id'])
+                continue
+            if record['op'] == 'put':
+                task = TaskRecord.from_dict(record['task'])
+                self.last_id = max(self.last_id, task_number(task.id) or 0)
+                old = self._tasks.get(task.id)
+                if old is None:
+                    self._insert(task)
+                else:
+                    # Posisi urutan penambahan tetap, hanya isinya diganti
+                    self._unindex_task(old)
+                    self._tasks[task.id] = task
+                    self._index_task(task)
+            elif record['op'] == 'del' and record['id'] in self._tasks:
+                self._discard(record['id'])
+            self.journal_records += 1
+        if corrupt:
+            self.save_tasks()
+
+    @exclusive
     def save_tasks(self):
-        """Menyimpan tugas ke file JSON"""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(self.tasks, f, indent=4, ensure_ascii=False)
+        """Menulis snapshot lengkap ke file JSON lalu mengosongkan journal (checkpoint)"""
+        temp_path = self.file_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump([task.to_dict() for task in self._tasks.values()],
+                      f, indent=4, ensure_ascii=False)
+        os.replace(temp_path, self.file_path)
+        self._snapshot_stamp = file_stamp(self.file_path)
+
+        # Journal diganti dengan satu record meta agar nomor ID terakhir tetap
+        # tersimpan walau tugasnya sudah dihapus. Jika crash sebelum langkah
+        # ini, memutar ulang journal lama di atas snapshot baru tetap aman
+        temp_path = self.journal_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"op": "meta", "last_id": self.last_id}) + "\n")
+        os.replace(temp_path, self.journal_path)
+        journal = file_stamp(self.journal_path)
+        self._journal_inode, self._journal_offset = journal[0], journal[2]
+        self.journal_records = 0
+
+    def _log(self, record):
+        """Menambahkan satu record perubahan ke journal (ditunda selama batch)"""
+        if self._batch is not None:
+            self._batch['records'].append(record)
+            return
+        self._append_records([record])
+
+    def _encode_records(self, records):
+        """Mengubah record journal menjadi baris JSON ringkas dalam bytes"""
+        return "".join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n"
+            for record in records
+        ).encode('utf-8')
+
+    @exclusive
+    def _append_records(self, records, sync=False, segment=None, spilled=0):
+        """Menulis record ke journal dalam satu kali tulis
+
+        ``segment`` adalah file sementara berisi ``spilled`` record batch
+        yang sudah di-encode; isinya disalin lebih dulu per blok.
+        """
+        with open(self.journal_path, 'ab') as f:
+            if segment is not None:
+                segment.seek(0)
+                shutil.copyfileobj(segment, f)
+            f.write(self._encode_records(records))
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_inode = os.fstat(f.fileno()).st_ino
+            self._journal_offset = f.tell()
+        self.journal_records += len(records) + spilled
+
+        # Checkpoint saat journal lebih panjang dari jumlah tugas, sehingga
+        # biaya menulis ulang snapshot tersebar rata ke setiap perubahan
+        if self.journal_records > max(self.checkpoint_interval, len(self._tasks)):
+            self.save_tasks()
+
+    def _remember(self, task_id):
+        """Menyimpan keadaan asli tugas sebelum diubah pertama kali dalam batch"""
+        if self._batch is None or task_id in self._batch['originals']:
+            return
+        task = self._tasks.get(task_id)
+        # Tugas baru tidak perlu dicatat: urutannya lebih besar dari
+        # urutan terakhir saat batch dimulai
+        if task is not None:
+            self._batch['originals'][task_id] = (self._order[task_id], task.copy())
+
+    def _spill(self):
+        """Memindahkan record batch yang tertunda ke file segment sementara
+
+        Dipakai impor per chunk agar record journal tidak menumpuk di memori
+        sampai batch selesai.
+        """
+        batch = self._batch
+        if batch is None or not batch['records']:
+            return
+        if batch['segment'] is None:
+            batch['segment'] = tempfile.TemporaryFile(
+                dir=os.path.dirname(os.path.abspath(self.journal_path))
+            )
+        batch['segment'].write(self._encode_records(batch['records']))
+        batch['spilled'] += len(batch['records'])
+        batch['records'] = []
+
+    @contextmanager
+    def batch(self):
+        """Mengelompokkan banyak perubahan menjadi satu kali tulis ke journal
+
+        Perubahan di dalam blok langsung terlihat di memori, tetapi baru
+        ditulis (dan di-fsync) saat blok selesai. Jika terjadi exception,
+        semua tugas dikembalikan ke keadaan sebelum blok dan tidak ada yang
+        ditulis. Batch bersarang ikut ke batch terluar.
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        # Lock dipegang sepanjang batch agar tidak ada tulisan lain di tengahnya
+        with self._exclusive():
+            self._batch = {"records": [], "originals": {}, "last_id": self.last_id,
+                           "sequence": self._sequence, "segment": None, "spilled": 0}
+            try:
+                yield self
+            except BaseException:
+                self._rollback()
+                raise
+            batch, self._batch = self._batch, None
+            try:
+                if batch['records'] or batch['spilled']:
+                    self._append_records(batch['records'], sync=True,
+                                         segment=batch['segment'], spilled=batch['spilled'])
+            finally:
+                if batch['segment'] is not None:
+                    batch['segment'].close()
+
+    def _rollback(self):
+        """Mengembalikan tugas yang diubah dalam batch lalu membangun ulang indeks"""
+        batch, self._batch = self._batch, None
+        if batch['segment'] is not None:
+            batch['segment'].close()
+        tasks = dict(self._tasks)
+        order = dict(self._order)
+        for task_id, position in self._order.items():
+            if position > batch['sequence'] and task_id not in batch['originals']:
+                del tasks[task_id]
+        for task_id, original in batch['originals'].items():
+            order[task_id], tasks[task_id] = original
+        self.last_id = batch['last_id']
+        self.tasks = sorted(tasks.values(), key=lambda task: order[task.id])
+
+    def _log_put(self, task):
+        """Mencatat isi terbaru satu tugas ke journal"""
+        self._log({"op": "put", "task": task.to_dict()})
+
+    def _log_delete(self, task_id):
+        """Mencatat penghapusan satu tugas ke journal"""
+        self._log({"op": "del", "id": task_id})
 
     def generate_task_id(self):
-        """Generate ID unik untuk tugas baru"""
-        if not self.tasks:
-            return "task_001"
-        last_id = max([int(task['id'].split('_')[1]) for task in self.tasks])
-        return f"task_{last_id + 1:03d}"
+        """Generate ID unik untuk tugas baru dalam O(1)"""
+        self.last_id += 1
+        return f"task_{self.last_id:03d}"
 
+    @exclusive
     def add_task(self, title, description, category, priority, due_date):
         """Menambahkan tugas baru"""
+        return self._new_task(title, description, category, priority, due_date)
+
+    def _new_task(self, title, description, category, priority, due_date,
+                  status="Pending", created_at=None, completed_at=None, progress=0):
+        """Memvalidasi lalu menyimpan satu tugas baru (dipakai add_task dan impor)"""
         if category not in self.categories:
             raise ValueError("Kategori tidak valid!")
         if priority not in self.priorities:
             raise ValueError("Prioritas tidak valid!")
 
-        # Validasi format tanggal
-        try:
-            datetime.strptime(due_date, '%Y-%m-%d')
-        except ValueError:
-            raise ValueError("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
-
-        task = {
-            "id": self.generate_task_id(),
-            "title": title,
-            "description": description,
-            "category": category,
-            "priority": priority,
-            "status": "Pending",
-            "due_date": due_date,
-            "created_at": date.today().isoformat(),
-            "completed_at": None,
-            "progress": 0
-        }
+        validate_date(due_date)
 
-        self.tasks.append(task)
-        self.save_tasks()
+        task = TaskRecord(
+            id=self.generate_task_id(),
+            title=title,
+            description=description,
+            category=category,
+            priority=priority,
+            status=status,
+            due_date=due_date,
+            created_at=created_at or date.today().isoformat(),
+            completed_at=completed_at,
+            progress=progress
+        )
+
+        self._insert(task)
+        self._log_put(task)
         return task
 
+    def add_tasks(self, tasks):
+        """Menambahkan banyak tugas sekaligus dalam satu batch
+
+        Setiap item adalah dict argumen add_task (title, description,
+        category, priority, due_date). Jika satu item tidak valid, tidak ada
+        tugas yang ditambahkan.
+        """
+        with self.batch():
+            return [self.add_task(**item) for item in tasks]
+
+    def import_tasks(self, path, chunk_size=1000, progress=None):
+        """Mengimpor tugas dari file CSV/JSONL dalam satu batch
+
+        File dibaca dan divalidasi per chunk sehingga memori untuk membaca
+        tidak bergantung pada ukuran file. Baris yang tidak valid dilewati
+        dan dilaporkan sebagai (nomor baris, pesan) tanpa menghentikan
+        impor. Record journal setiap chunk dipindah ke file segment
+        sementara, lalu disalin ke journal sekali di akhir, sehingga tidak
+        ada record yang menumpuk di memori selama impor. Setiap
+        tugas mendapat ID baru; kolom id di file diabaikan, kolom lain hasil
+        export_tasks (status, progress, created_at, completed_at) dipakai
+        apa adanya.
+        """
+        rows = iter_task_rows(path)
+        imported = 0
+        errors = []
+        with self.batch():
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                for number, row in chunk:
+                    try:
+                        self._import_row(row)
+                        imported += 1
+                    except ValueError as e:
+                        errors.append((number, str(e)))
+                self._spill()
+                if progress:
+                    progress(imported, len(errors))
+        return {"imported": imported, "errors": errors}
+
+    def _import_row(self, row):
+        """Memvalidasi satu baris impor lalu menambahkannya sebagai tugas"""
+        if row is None:
+            raise ValueError("Baris bukan objek JSON yang valid!")
+        # Baris JSONL bisa berisi tipe apa pun, tolak sebelum dipakai sebagai string
+        title = row.get('title') or ""
+        description = row.get('description') or ""
+        if not isinstance(title, str):
+            raise ValueError("Judul harus berupa teks!")
+        if not isinstance(description, str):
+            raise ValueError("Deskripsi harus berupa teks!")
+        title = title.strip()
+        if not title:
+            raise ValueError("Judul tidak boleh kosong!")
+        status = row.get('status') or "Pending"
+        if status not in self.statuses:
+            raise ValueError("Status tidak valid!")
+
+        # Progress dan tanggal dari file ekspor dipertahankan; jika kosong
+        # diisi seperti update_task_status
+        progress = row.get('progress')
+        if progress is None or progress == "":
+            progress = 100 if status == "Completed" else 0
+        else:
+            try:
+                progress = int(progress)
+            except (TypeError, ValueError):
+                raise ValueError("Progress harus antara 0-100!")
+            if not 0 <= progress <= 100:
+                raise ValueError("Progress harus antara 0-100!")
+
+        created_at = row.get('created_at') or None
+        if created_at is not None:
+            validate_date(created_at)
+        completed_at = None
+        if status in ("Completed", "Cancelled"):
+            completed_at = row.get('completed_at') or date.today().isoformat()
+            validate_date(completed_at)
+
+        return self._new_task(
+            title, description, row.get('category'), row.get('priority'),
+            row.get('due_date'), status, created_at, completed_at, progress
+        )
+
+    def export_tasks(self, path):
+        """Mengekspor semua tugas ke file CSV/JSONL baris per baris"""
+        fmt = transfer_format(path)
+        self.refresh()
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            if fmt == "csv":
+                writer = csv.DictWriter(f, fieldnames=TaskRecord.FIELDS)
+                writer.writeheader()
+                for task in self._tasks.values():
+                    writer.writerow(task.to_dict())
+            else:
+                for task in self._tasks.values():
+                    f.write(json.dumps(task.to_dict(), ensure_ascii=False) + "\n")
+        return len(self._tasks)
+
     def get_all_tasks(self):
-        """Mengambil semua tugas"""
-        return sorted(self.tasks, key=lambda x: (
-            self.priorities.index(x['priority']),
-            x['due_date']
-        ))
+        """Mengambil semua tugas terurut prioritas lalu due date"""
+        return [self._tasks[key[-1]] for key in self._sorted]
 
     def get_task_by_id(self, task_id):
         """Mengambil tugas berdasarkan ID"""
-        for task in self.tasks:
-            if task['id'] == task_id:
-                return task
-        return None
+        return self._tasks.get(task_id)
+
+    def filter_tasks(self, status=None, priority=None, category=None):
+        """Mengambil tugas yang cocok dengan semua filter, sesuai urutan penambahan
+
+        Filter yang diisi dicocokkan lewat irisan bucket indeks, dimulai
+        dari bucket terkecil, tanpa memindai seluruh tugas.
+        """
+        if status is not None and status not in self.statuses:
+            raise ValueError("Status tidak valid!")
+        if priority is not None and priority not in self.priorities:
+            raise ValueError("Prioritas tidak valid!")
+        if category is not None and category not in self.categories:
+            raise ValueError("Kategori tidak valid!")
+
+        buckets = [
+            self._buckets[field].get(value, {})
+            for field, value in (("status", status), ("priority", priority), ("category", category))
+            if value is not None
+        ]
+        if not buckets:
+            return self.tasks
+
+        buckets.sort(key=len)
+        smallest, others = buckets[0], buckets[1:]
+        task_ids = [
+            task_id for task_id in smallest
+            if all(task_id in bucket for bucket in others)
+        ]
+        task_ids.sort(key=self._order.__getitem__)
+        return [self._tasks[task_id] for task_id in task_ids]
 
     def get_tasks_by_status(self, status):
         """Mengambil tugas berdasarkan status"""
-        if status not in self.statuses:
-            raise ValueError("Status tidak valid!")
-        return [task for task in self.tasks if task['status'] == status]
+        return self.filter_tasks(status=status)
 
     def get_tasks_by_priority(self, priority):
         """Mengambil tugas berdasarkan prioritas"""
-        if priority not in self.priorities:
-            raise ValueError("Prioritas tidak valid!")
-        return [task for task in self.tasks if task['priority'] == priority]
+        return self.filter_tasks(priority=priority)
 
     def get_tasks_by_category(self, category):
         """Mengambil tugas berdasarkan kategori"""
-        if category not in self.categories:
-            raise ValueError("Kategori tidak valid!")
-        return [task for task in self.tasks if task['category'] == category]
+        return self.filter_tasks(category=category)
 
+    @exclusive
     def update_task_status(self, task_id, new_status):
         """Mengupdate status tugas"""
         if new_status not in self.statuses:
@@ -104,18 +677,26 @@ class TodoManager:
         if not task:
             raise ValueError("Tugas tidak ditemukan!")
 
-        task['status'] = new_status
+        self._unindex_task(task)
+        task.status = new_status
         if new_status == "Completed":
-            task['completed_at'] = date.today().isoformat()
-            task['progress'] = 100
+            task.completed_at = date.today().isoformat()
+            task.progress = 100
         elif new_status == "Cancelled":
-            task['completed_at'] = date.today().isoformat()
+            task.completed_at = date.today().isoformat()
         else:
-            task['completed_at'] = None
+            task.completed_at = None
 
-        self.save_tasks()
+        self._index_task(task)
+        self._log_put(task)
         return task
 
+    def update_status_many(self, task_ids, new_status):
+        """Mengupdate status banyak tugas sekaligus dalam satu batch"""
+        with self.batch():
+            return [self.update_task_status(task_id, new_status) for task_id in task_ids]
+
+    @exclusive
     def update_task_progress(self, task_id, progress):
         """Mengupdate progress tugas"""
         if not 0 <= progress <= 100:
@@ -125,20 +706,23 @@ class TodoManager:
         if not task:
             raise ValueError("Tugas tidak ditemukan!")
 
-        task['progress'] = progress
+        self._unindex_task(task)
+        task.progress = progress
         if progress == 100:
-            task['status'] = "Completed"
-            task['completed_at'] = date.today().isoformat()
+            task.status = "Completed"
+            task.completed_at = date.today().isoformat()
         elif progress == 0:
-            task['status'] = "Pending"
-            task['completed_at'] = None
+            task.status = "Pending"
+            task.completed_at = None
         else:
-            task['status'] = "In Progress"
-            task['completed_at'] = None
+            task.status = "In Progress"
+            task.completed_at = None
 
-        self.save_tasks()
+        self._index_task(task)
+        self._log_put(task)
         return task
 
+    @exclusive
     def update_task_details(self, task_id, title=None, description=None, 
                           category=None, priority=None, due_date=None):
         """Mengupdate detail tugas"""
@@ -151,46 +735,102 @@ class TodoManager:
         if priority and priority not in self.priorities:
             raise ValueError("Prioritas tidak valid!")
         if due_date:
-            try:
-                datetime.strptime(due_date, '%Y-%m-%d')
-            except ValueError:
-                raise ValueError("Format tanggal tidak valid! Gunakan YYYY-MM-DD")
+            validate_date(due_date)
 
+        self._unindex_task(task)
         if title:
-            task['title'] = title
+            task.title = title
         if description:
-            task['description'] = description
+            task.description = description
         if category:
-            task['category'] = category
+            task.category = category
         if priority:
-            task['priority'] = priority
+            task.priority = priority
         if due_date:
-            task['due_date'] = due_date
+            task.due_date = due_date
 
-        self.save_tasks()
+        self._index_task(task)
+        self._log_put(task)
         return task
 
+    @exclusive
     def delete_task(self, task_id):
         """Menghapus tugas"""
         task = self.get_task_by_id(task_id)
         if not task:
             raise ValueError("Tugas tidak ditemukan!")
 
-        self.tasks.remove(task)
-        self.save_tasks()
+        self._discard(task_id)
+        self._log_delete(task_id)
         return True
 
+    @exclusive
     def delete_completed_tasks(self):
         """Menghapus semua tugas yang sudah selesai"""
-        initial_count = len(self.tasks)
-        self.tasks = [task for task in self.tasks if task['status'] != "Completed"]
-        self.save_tasks()
-        return initial_count - len(self.tasks)
+        completed = list(self._buckets['status'].get("Completed", {}))
+        with self.batch():
+            for task_id in completed:
+                self._discard(task_id)
+                self._log_delete(task_id)
+        return len(completed)
+
+    def get_statistics(self):
+        """Ringkasan jumlah tugas per status/prioritas/kategori, tanpa memindai tugas
+
+        Jumlah per nilai dibaca dari ukuran bucket indeks dan rata-rata
+        progress dari penjumlah yang diperbarui setiap perubahan. Jumlah
+        tugas terlambat bergantung pada tanggal hari ini, jadi dihitung
+        dengan bisect pada indeks due date.
+        """
+        total = len(self._tasks)
+        counts = {
+            field: {value: len(self._buckets[field].get(value, {})) for value in values}
+            for field, values in (("status", self.statuses), ("priority", self.priorities),
+                                  ("category", self.categories))
+        }
+        today = date.today().toordinal()
+        completed = counts['status']["Completed"]
+        return {
+            "total": total,
+            "by_status": counts['status'],
+            "by_priority": counts['priority'],
+            "by_category": counts['category'],
+            "completion_rate": round(completed * 100 / total, 1) if total else 0.0,
+            "average_progress": round(self._progress_total / total, 1) if total else 0.0,
+            "overdue": bisect.bisect_left(self._open_by_due, (today,))
+        }
+
+    def _due_range(self, keys, start, end):
+        """Mengambil tugas dari indeks due date antara dua ordinal (inklusif)"""
+        low = bisect.bisect_left(keys, (start,))
+        high = bisect.bisect_left(keys, (end + 1,))
+        return [self._tasks[key[2]] for key in keys[low:high]]
 
     def get_overdue_tasks(self):
-        """Mengambil tugas yang sudah melewati deadline"""
-        today = date.today().isoformat()
-        return [
-            task for task in self.tasks
-            if task['due_date'] < today and task['status'] not in ["Completed", "Cancelled"]
-        ]
\ No newline at end of file
+        """Mengambil tugas yang sudah melewati deadline, paling lama lebih dulu"""
+        today = date.today().toordinal()
+        high = bisect.bisect_left(self._open_by_due, (today,))
+        return [self._tasks[key[2]] for key in self._open_by_due[:high]]
+
+    def get_upcoming_tasks(self, limit=5):
+        """Mengambil N tugas terbuka dengan deadline terdekat mulai hari ini"""
+        today = date.today().toordinal()
+        low = bisect.bisect_left(self._open_by_due, (today,))
+        return [self._tasks[key[2]] for key in self._open_by_due[low:low + limit]]
+
+    def get_tasks_due_between(self, start_date, end_date):
+        """Mengambil tugas dengan due date di antara dua tanggal (inklusif)"""
+        start = validate_date(start_date)
+        end = validate_date(end_date)
+        if end < start:
+            raise ValueError("Tanggal akhir tidak boleh sebelum tanggal awal!")
+        return self._due_range(self._by_due, start, end)
+
+    def get_calendar(self, year, month):
+        """Mengelompokkan tugas per tanggal dalam satu bulan"""
+        first = date(year, month, 1).toordinal()
+        next_month = date(year + month // 12, month % 12 + 1, 1).toordinal()
+        days = {}
+        for task in self._due_range(self._by_due, first, next_month - 1):
+            days.setdefault(task.due_ordinal - first + 1, []).append(task)
+        return days
\ No newline at end of file
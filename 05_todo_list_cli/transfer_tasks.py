@@ -0,0 +1,44 @@
+import argparse
+import os
+from todo_manager import TodoManager
+
+def print_progress(imported, rejected):
+    """Menampilkan progress impor di satu baris"""
+    print(f"\rDiimpor: {imported}, ditolak: {rejected}", end="", flush=True)
+
+def main():
+    """Mengimpor atau mengekspor tugas dalam format CSV/JSONL"""
+    parser = argparse.ArgumentParser(description="Impor/ekspor tugas")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path", help="file .csv atau .jsonl")
+    parser.add_argument("--file", default="tasks.json", help="file penyimpanan tugas")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="jumlah baris yang divalidasi per chunk")
+    parser.add_argument("--show-errors", type=int, default=20,
+                        help="jumlah baris ditolak yang ditampilkan")
+    args = parser.parse_args()
+
+    if args.command == "import" and not os.path.exists(args.path):
+        parser.error(f"File {args.path} tidak ditemukan")
+
+    manager = TodoManager(args.file)
+    try:
+        if args.command == "export":
+            count = manager.export_tasks(args.path)
+            print(f"{count} tugas diekspor ke {args.path}")
+            return
+
+        report = manager.import_tasks(args.path, args.chunk_size, progress=print_progress)
+        print()
+        print(f"{report['imported']} tugas diimpor, {len(report['errors'])} baris ditolak.")
+        for number, message in report['errors'][:args.show_errors]:
+            print(f"  Baris {number}: {message}")
+        if len(report['errors']) > args.show_errors:
+            print(f"  ... dan {len(report['errors']) - args.show_errors} baris lainnya")
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        manager.close()
+
+if __name__ == "__main__":
+    main()